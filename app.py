@@ -0,0 +1,1646 @@
+# app.py - Auto File Renamer GUI (Final Pro Version with Help & About)
+import time
+
+STARTUP_T0 = time.perf_counter()
+
+import customtkinter as ctk
+import tkinter as tk
+from tkinter import filedialog, messagebox
+from pathlib import Path
+import csv
+import json
+import logging
+from datetime import datetime
+import threading
+from file_index import FileIndex
+from file_model import FileListModel, EventBatcher
+from scan_worker import ScanWorker
+from widgets import EditableGrid, VirtualFileList
+from search_index import SearchIndex, SEARCH_DEBOUNCE_MS
+from naming import NamingEngine, finalized_filename, quantity_token
+from batch import BatchExecutor, DEFAULT_WORKERS, plan_undo
+from history import RenameHistory
+from transaction import BatchTransaction
+from backup import BackupStore, KEEP_DAYS, KEEP_SNAPSHOTS
+from parties import PartyMap
+from categories import CategoryIndex
+from rename_plan import RenamePlan
+from plt_extents import PlotSizes
+from scanner import is_done_folder
+from perf import PerfRecorder
+from log_setup import log_batch_summary, setup_logging
+from core import (
+    ALLOWED_EXTENSIONS, DEFAULT_KEYWORDS, DEFAULT_MACHINE,
+    create_default_parties_csv, move_to_done, read_categories, read_party_map, read_quantity_keywords,
+    restore_file
+)
+
+# ============ Version Info ============
+APP_NAME = "Auto File Renamer Pro"
+VERSION = "1.5.0"
+AUTHOR = "Jignesh Thummar"
+COPYRIGHT = "© 2025 Jignesh Thummar. All Rights Reserved."
+LICENSE = "Proprietary Software. Do not distribute."
+
+# ============ Paths ============
+project_dir = Path(__file__).parent
+logs_dir = project_dir / "logs"
+codes_dir = project_dir / "codes"
+config_dir = project_dir / "config"
+backup_dir = project_dir / "backup"
+
+# ============ Keyword Config Path ============
+keywords_file = config_dir / "keywords.json"
+
+# ============ Fonts ============
+FONT = ("Segoe UI", 12)
+TITLE_FONT = ("Segoe UI", 16, "bold")
+CODE_FONT = ("Consolas", 13)
+SMALL_FONT = ("Segoe UI", 10)
+
+# parties.csv and categories.csv are checked for edits this often
+CODES_POLL_MS = 2000
+
+
+def setup_environment():
+    """Create app folders, configure logging and theme (kept out of import time)"""
+    for folder in (logs_dir, codes_dir, config_dir, backup_dir):
+        folder.mkdir(exist_ok=True)
+
+    # ============ Configure Logging ============
+    setup_logging(logs_dir)
+
+    # ============ Set Appearance ============
+    ctk.set_appearance_mode("Dark")
+    ctk.set_default_color_theme("blue")
+
+
+def open_link(url):
+    import webbrowser  # Loaded on first click, not at startup
+    webbrowser.open(url)
+
+
+class FileRenamerApp(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+        self.title(f"{APP_NAME} v{VERSION}")
+        self.geometry("1000x780")
+        self.resizable(True, True)
+
+        # --- Paths ---
+        self.config_file = project_dir / "config.json"
+        self.file_index = FileIndex(project_dir / "file_index.db")
+        self.perf = PerfRecorder(logs_dir / f"{datetime.now().strftime('%Y-%m-%d')}.perf.jsonl")
+
+        # --- Data ---
+        self.selected_root = None
+        self.selected_file = None
+        self.allowed_extensions = set(ALLOWED_EXTENSIONS)
+        self.party_map = PartyMap()
+        self.parties_signature = None
+        self.categories = CategoryIndex()
+        self.categories_signature = None
+        self.finalize_grid = None
+        self.party_fuzzy = False
+        self.check_duplicates = False
+        self.read_plot_size = True
+        self.history = RenameHistory(project_dir / "rename_journal.jsonl")
+        # Batch transaction files live next to the journal; deferred ones are asked about on the next start
+        self.batch_txn_dir = project_dir
+        self.deferred_batches = set()
+        # One batch rename, finalize or undo at a time: set from confirmation until its report
+        self.batch_running = False
+        self.auto_observer = None
+        self.search_index = SearchIndex(self.search_text)
+        self.search_after_id = None
+        self.file_model = FileListModel(self.allowed_extensions, self.search_index)
+        self.scan_worker = ScanWorker(self, self.on_scan_batch, self.on_scan_done, self.on_scan_error)
+        self.events_during_scan = []
+        self.scan_found = 0
+        self.scan_span = None
+        self.scan_stats = {}
+        self.filtered_file_list = []  # For search
+        self.machine_var = ctk.StringVar(value=DEFAULT_MACHINE)
+        self.show_done_var = ctk.BooleanVar(value=False)
+        self.last_folder = ""
+        self.batch_workers = DEFAULT_WORKERS
+        self.backup_keep = KEEP_SNAPSHOTS
+        self.backup_keep_days = KEEP_DAYS
+        self.quantity_keywords = []
+        self.naming = NamingEngine()
+        self.rename_plan = RenamePlan(self)
+        self.first_run = True
+        self.startup_marks = {}
+
+                # ============ Version & Update Config ============
+        self.CURRENT_VERSION = "1.5.0"
+        self.UPDATE_URL = "https://raw.githubusercontent.com/jigsthummar007/AutoRenamer/main/version.txt"
+
+        # --- Load Config ---
+        self.load_config()
+        self.rename_plan.check_duplicates = self.check_duplicates
+        if self.read_plot_size:
+            self.rename_plan.plot_sizes = PlotSizes(project_dir / "plot_sizes.db")
+        self.load_keywords()
+        self.batch_executor = BatchExecutor(self.batch_workers)
+        self.undo_executor = BatchExecutor.for_undo(self.batch_workers)
+        self.finalize_executor = BatchExecutor.for_finalize(self.batch_workers)
+
+        # --- Menu Bar ---
+        self.create_menu_bar()
+
+        # --- Startup Wizard ---
+        self.after(100, self.run_startup_wizard)
+
+        # ============ Grid Layout ============
+        self.grid_columnconfigure(1, weight=1)
+        self.grid_rowconfigure(3, weight=1)
+
+        # ============ Sidebar ============
+        self.sidebar_frame = ctk.CTkFrame(self, width=260, corner_radius=12, fg_color="#2a2d30")
+        self.sidebar_frame.grid(row=0, column=0, rowspan=7, sticky="nswe", padx=12, pady=12)
+        self.sidebar_frame.grid_propagate(False)
+
+        ctk.CTkLabel(self.sidebar_frame, text="📁 File Manager", font=TITLE_FONT).pack(pady=(12, 8))
+
+        self.folder_btn = ctk.CTkButton(
+            self.sidebar_frame,
+            text="📁 Select 2025 Folder",
+            command=self.select_folder,
+            height=40,
+            font=FONT
+        )
+        self.folder_btn.pack(pady=8, padx=16, fill="x")
+
+        self.scan_btn = ctk.CTkButton(
+            self.sidebar_frame,
+            text="⟳ Scan Files",
+            command=self.scan_folder,
+            height=35
+        )
+        self.scan_btn.pack(pady=6, padx=16, fill="x")
+
+        # --- Auto-scan ---
+        self.auto_scan_var = ctk.BooleanVar(value=True)
+        self.auto_scan_switch = ctk.CTkSwitch(
+            self.sidebar_frame,
+            text="🔁 Auto-scan",
+            variable=self.auto_scan_var,
+            command=self.toggle_auto_scan,
+            font=FONT
+        )
+        self.auto_scan_switch.pack(pady=10, padx=16, anchor="w")
+
+        # --- Show Done Files ---
+        self.show_done_switch = ctk.CTkSwitch(
+            self.sidebar_frame,
+            text="👁️ Show Finalize Files",
+            variable=self.show_done_var,
+            command=self.scan_folder,
+            font=FONT
+        )
+        self.show_done_switch.pack(pady=8, padx=16, anchor="w")
+
+        # --- Machine Type ---
+        ctk.CTkLabel(self.sidebar_frame, text="🖨️ Machine:", font=FONT).pack(pady=(12, 4), anchor="w", padx=20)
+        self.machine_dropdown = ctk.CTkComboBox(
+            self.sidebar_frame,
+            values=["(C.S)", "(C.E)"],
+            variable=self.machine_var,
+            font=FONT,
+            dropdown_font=FONT
+        )
+        self.machine_dropdown.pack(pady=6, padx=20, fill="x")
+        self.machine_var.trace_add("write", lambda *args: self.plan_config_changed())
+
+        # --- Edit Keywords Button ---
+        self.keywords_btn = ctk.CTkButton(
+            self.sidebar_frame,
+            text="🔧 Edit Quantity Keywords",
+            command=self.open_keywords_editor,
+            fg_color="orange",
+            hover_color="dark orange",
+            height=32
+        )
+        self.keywords_btn.pack(pady=8, padx=16, fill="x")
+
+        # --- Reload CSV ---
+        self.reload_csv_btn = ctk.CTkButton(
+            self.sidebar_frame,
+            text="🔁 Reload Parties",
+            command=self.load_parties_csv,
+            fg_color="#8a2be2",
+            hover_color="#7a1dd1",
+            height=32
+        )
+        self.reload_csv_btn.pack(pady=12, padx=16, fill="x")
+
+        # --- Export Log Button ---
+        self.export_log_btn = ctk.CTkButton(
+            self.sidebar_frame,
+            text="📊 Export Rename Log",
+            command=self.export_rename_log,
+            fg_color="teal",
+            hover_color="dark teal",
+            height=32
+        )
+        self.export_log_btn.pack(pady=8, padx=16, fill="x")
+
+        # ============ Main Area ============
+        self.main_frame = ctk.CTkFrame(self, corner_radius=12)
+        self.main_frame.grid(row=0, column=1, sticky="nswe", padx=12, pady=12)
+        self.main_frame.grid_columnconfigure(0, weight=1)
+        self.main_frame.grid_rowconfigure(3, weight=1)
+
+        # --- Search Box ---
+        search_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
+        search_frame.grid(row=0, column=0, columnspan=2, sticky="we", pady=(0, 5))
+        ctk.CTkLabel(search_frame, text="🔍 Search:", font=FONT).pack(side="left")
+        self.search_var = ctk.StringVar()
+        self.search_var.trace("w", self.on_search_typed)
+        self.search_entry = ctk.CTkEntry(search_frame, textvariable=self.search_var, placeholder_text="Filter files...")
+        self.search_entry.pack(side="left", fill="x", expand=True, padx=(5, 0))
+
+        # --- Selected File ---
+        self.file_label = ctk.CTkLabel(self.main_frame, text="No file selected", font=TITLE_FONT)
+        self.file_label.grid(row=1, column=0, columnspan=2, sticky="w", pady=(5, 5))
+
+        # --- Preview ---
+        self.preview_label = ctk.CTkLabel(
+            self.main_frame,
+            text="Preview: --",
+            font=CODE_FONT,
+            text_color="lightgray",
+            justify="left",
+            anchor="w"
+        )
+        self.preview_label.grid(row=2, column=0, columnspan=2, pady=10, sticky="w")
+
+        # --- Buttons ---
+        btn_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
+        btn_frame.grid(row=3, column=0, columnspan=2, sticky="w", pady=5)
+
+        self.rename_btn = ctk.CTkButton(btn_frame, text="✅ Rename", command=self.rename_file, width=100)
+        self.rename_btn.grid(row=0, column=0, padx=(0, 10))
+
+        self.undo_btn = ctk.CTkButton(btn_frame, text="↩ Undo", command=self.undo_rename, width=90)
+        self.undo_btn.grid(row=0, column=1, padx=(0, 5))
+
+        self.redo_btn = ctk.CTkButton(btn_frame, text="⟳ Redo", command=self.redo_rename, width=90)
+        self.redo_btn.grid(row=0, column=2)
+
+        self.undo_all_btn = ctk.CTkButton(btn_frame, text="↩ Undo All", command=self.undo_all_batch, width=90, fg_color="red")
+        self.undo_all_btn.grid(row=0, column=3, padx=(5, 0))
+
+        # --- File List ---
+        self.file_listbox = VirtualFileList(
+            self.main_frame,
+            format_row=self.format_file_row,
+            command=self.on_file_click,
+            font=CODE_FONT
+        )
+        self.file_listbox.grid(row=4, column=0, columnspan=2, sticky="nswe", pady=5)
+
+        # --- Select All Button ---
+        self.select_all_btn = ctk.CTkButton(
+            self.main_frame,
+            text="📁 Batch Rename",
+            command=self.select_all_files,
+            fg_color="green",
+            hover_color="dark green",
+            height=36
+        )
+        self.select_all_btn.grid(row=5, column=0, columnspan=2, sticky="we", padx=10, pady=(6, 0))
+
+        # --- Status Bar ---
+        self.status_label = ctk.CTkLabel(self, text="Ready", anchor="w", font=FONT)
+        self.status_label.grid(row=6, column=0, columnspan=2, sticky="we", padx=16, pady=4)
+
+        # --- Footer ---
+        footer_frame = ctk.CTkFrame(self, fg_color="transparent")
+        footer_frame.grid(row=7, column=0, columnspan=2, pady=(0, 10), sticky="s")
+
+        ctk.CTkLabel(footer_frame, text="📱", font=SMALL_FONT).pack(side="left", padx=(0, 2))
+        whatsapp_btn = ctk.CTkButton(
+            footer_frame, text="WhatsApp", width=80, height=20, font=SMALL_FONT,
+            command=lambda: open_link("https://wa.me/919825531314")
+        )
+        whatsapp_btn.pack(side="left", padx=2)
+
+        ctk.CTkLabel(footer_frame, text="📸", font=SMALL_FONT).pack(side="left", padx=(10, 2))
+        insta_btn = ctk.CTkButton(
+            footer_frame, text="@official.jignesh.1", width=120, height=20, font=SMALL_FONT,
+            command=lambda: open_link("https://instagram.com/official.jignesh.1")
+        )
+        insta_btn.pack(side="left", padx=2)
+
+        ctk.CTkLabel(footer_frame, text="✉️", font=SMALL_FONT).pack(side="left", padx=(10, 2))
+        email_btn = ctk.CTkButton(
+            footer_frame, text="Email Me", width=80, height=20, font=SMALL_FONT,
+            command=lambda: open_link("mailto:Jigsthummar1990@gmail.com")
+        )
+        email_btn.pack(side="left", padx=2)
+
+        # ============ Keyboard Shortcuts ============
+        self.bind("<Control-o>", lambda e: self.select_folder())
+        self.bind("<Control-s>", lambda e: self.scan_folder())
+        self.bind("<Control-r>", lambda e: self.rename_file() if self.selected_file else None)
+        self.bind("<Control-z>", lambda e: self.undo_rename())
+        self.bind("<Control-y>", lambda e: self.redo_rename())
+        self.bind("<Control-a>", lambda e: self.select_all_files())
+
+        # --- Auto-scan init ---
+        self.toggle_auto_scan()
+
+        self.load_parties_csv(refresh=False)
+        self.load_categories_csv()
+
+        # --- Staged startup: everything slow runs after the first paint ---
+        self.mark_startup("init")
+        self.after_idle(self.start_up)
+
+    def mark_startup(self, stage):
+        """Record ms since launch for a startup stage (first one wins)"""
+        if stage not in self.startup_marks:
+            self.startup_marks[stage] = round((time.perf_counter() - STARTUP_T0) * 1000, 1)
+            if stage == "interactive":
+                logging.info(f"Startup timings (ms): {self.startup_marks}")
+
+    def start_up(self):
+        """Startup stages that must not delay the window"""
+        self.mark_startup("first_paint")
+        # --- Load last folder: one background scan, then the watcher ---
+        if self.last_folder:
+            self.selected_root = Path(self.last_folder)
+            self.scan_folder()
+            self.toggle_auto_scan()
+        else:
+            self.mark_startup("interactive")
+        # ♻️ Offer to finish or revert a batch interrupted by a crash
+        self.after(500, self.recover_unfinished_batch)
+        # 💾 Backup once the first scan had a head start
+        self.after(1000, self.create_backup)
+        # 🔔 Check for update 2 seconds after launch
+        self.after(2000, self.check_for_update)
+        # 🔁 Pick up parties.csv / categories.csv edits without a restart
+        self.after(CODES_POLL_MS, self.watch_code_files)
+
+    def create_menu_bar(self):
+        """Create menu bar with Help and About"""
+        menubar = tk.Menu(self)
+        
+        # Help Menu
+        help_menu = tk.Menu(menubar, tearoff=0)
+        help_menu.add_command(label="Usage Guide", command=self.show_help_usage)
+        help_menu.add_command(label="Keyboard Shortcuts", command=self.show_help_shortcuts)
+        menubar.add_cascade(label="📘 Help", menu=help_menu)
+
+        # Stats Panel
+        menubar.add_command(label="📊 Stats", command=self.show_stats_panel)
+
+        # About Menu
+        menubar.add_command(label="ℹ️ About", command=self.show_about)
+
+        self.configure(menu=menubar)
+
+    def show_help_shortcuts(self):
+        """Show keyboard shortcuts"""
+        msg = """
+📌 Keyboard Shortcuts:
+
+• Ctrl + O → Select Folder
+• Ctrl + S → Scan Files
+• Ctrl + R → Rename Selected File
+• Ctrl + Z → Undo Last Rename
+• Ctrl + Y → Redo Rename
+• Ctrl + A → Batch Rename All Files
+
+💡 Tip: Click any file to preview rename.
+💡 Tip: In 'Show Done Files', click a file or press Ctrl + A to finalize all files in one grid.
+"""
+        messagebox.showinfo("📘 Help: Keyboard Shortcuts", msg)
+
+    def show_help_usage(self):
+        """Show how to use the app"""
+        msg = """
+📘 How to Use Auto File Renamer:
+
+1. Click '📁 Select 2025 Folder' to set root
+2. Files will appear in the list
+3. Click any file to see rename preview
+4. Click '✅ Rename' to process
+5. File moves to 'Done' folder automatically
+6. Use '📁 Batch Rename' for multiple files
+7. Use '🔧 Edit Keywords' to add 'layout', 'design', etc.
+8. Use '👁️ Show Finalize Files' and click a file to set Qty/Cat (e.g. %8%) for all files in one grid
+
+📁 Folder Structure:
+2025 → Month → Date → Party → File.plt
+
+📤 Output:
+{Code}_{Name} (C.S)(FT.1x2)(Q.2)%%.plt → Moved to 'Done'
+
+🔧 Keywords:
+- Use 'x' → '2 x' → (Q.2)
+- Add more via UI
+"""
+        messagebox.showinfo("📘 Help: Usage Guide", msg)
+
+    def show_about(self):
+        """Show about window"""
+        popup = ctk.CTkToplevel(self)
+        popup.title("ℹ️ About")
+        popup.geometry("450x500")
+        popup.resizable(False, False)
+        popup.transient(self)
+        popup.grab_set()
+
+        x = self.winfo_x() + (self.winfo_width() // 2) - 225
+        y = self.winfo_y() + (self.winfo_height() // 2) - 250
+        popup.geometry(f"+{int(x)}+{int(y)}")
+
+        ctk.CTkLabel(popup, text=APP_NAME, font=("Segoe UI", 18, "bold")).pack(pady=10)
+        ctk.CTkLabel(popup, text=f"Version {VERSION}", font=("Segoe UI", 14)).pack(pady=5)
+        ctk.CTkLabel(popup, text=f"By: {AUTHOR}", font=("Segoe UI", 14)).pack(pady=5)
+
+        ctk.CTkLabel(popup, text="📱 Contact:", font=("Segoe UI", 12, "bold")).pack(pady=(20, 5))
+        ctk.CTkLabel(popup, text="WhatsApp: +91 98255 31314", font=("Segoe UI", 12)).pack()
+        ctk.CTkLabel(popup, text="Instagram: @official.jignesh.1", font=("Segoe UI", 12)).pack()
+        ctk.CTkLabel(popup, text="Email: Jigsthummar1990@gmail.com", font=("Segoe UI", 12)).pack()
+
+        ctk.CTkLabel(popup, text="📜 License", font=("Segoe UI", 12, "bold")).pack(pady=(20, 5))
+        ctk.CTkLabel(popup, text=COPYRIGHT, font=("Segoe UI", 10), wraplength=400).pack(pady=5)
+        ctk.CTkLabel(popup, text="Proprietary Software. Do not distribute.", font=("Segoe UI", 10), wraplength=400).pack(pady=5)
+
+        ctk.CTkButton(
+            popup, text="📧 Send Email", width=120,
+            command=lambda: open_link("mailto:Jigsthummar1990@gmail.com")
+        ).pack(pady=10)
+
+        ctk.CTkButton(popup, text="Close", width=100, command=popup.destroy).pack(pady=10)
+
+
+    def show_stats_panel(self):
+        """Per-operation timings and the latest perf records"""
+        popup = ctk.CTkToplevel(self)
+        popup.title("📊 Performance Stats")
+        popup.geometry("760x480")
+        popup.transient(self)
+
+        x = self.winfo_x() + (self.winfo_width() // 2) - 380
+        y = self.winfo_y() + (self.winfo_height() // 2) - 240
+        popup.geometry(f"+{int(x)}+{int(y)}")
+
+        report = ctk.CTkTextbox(popup, font=CODE_FONT, wrap="none")
+        report.pack(fill="both", expand=True, padx=12, pady=(12, 0))
+
+        def fill():
+            lines = [f"{'Operation':<14}{'Count':>7}{'Avg ms':>10}{'Max ms':>10}{'Last ms':>10}"]
+            for op, t in sorted(self.perf.summary().items()):
+                lines.append(f"{op:<14}{t['count']:>7}{t['avg_ms']:>10}{t['max_ms']:>10}{t['last_ms']:>10}")
+            lines += ["", "Recent:"]
+            for rec in reversed(self.perf.recent_records(30)):
+                details = ", ".join(f"{k}={v}" for k, v in rec.items() if k not in ("ts", "op", "wall_ms"))
+                lines.append(f"{rec['ts'][11:]} {rec['op']:<13} {rec['wall_ms']:>9} ms  {details}")
+            report.configure(state="normal")
+            report.delete("0.0", "end")
+            report.insert("0.0", "\n".join(lines))
+            report.configure(state="disabled")
+
+        fill()
+        btn_frame = ctk.CTkFrame(popup, fg_color="transparent")
+        btn_frame.pack(pady=10)
+        ctk.CTkButton(btn_frame, text="🔄 Refresh", width=100, command=fill).pack(side="left", padx=5)
+        ctk.CTkButton(btn_frame, text="Close", width=100, command=popup.destroy).pack(side="left", padx=5)
+
+    def check_for_update(self):
+        """Check if a new version is available (network call runs off the Tk thread)"""
+        threading.Thread(target=self._fetch_latest_version, daemon=True).start()
+
+    def _fetch_latest_version(self):
+        import requests  # Loaded here so startup never pays for it
+        try:
+            response = requests.get(self.UPDATE_URL, timeout=5)
+            latest_version = response.text.strip()
+            self.after(0, self.on_update_checked, latest_version)
+        except requests.RequestException as e:
+            logging.warning(f"Update check failed: {e}")
+            self.after(0, lambda: self.status_label.configure(text=f"✅ Ready (v{self.CURRENT_VERSION}) - Update check failed"))
+        except Exception as e:
+            logging.error(f"Unexpected error in update check: {e}")
+            self.after(0, lambda: self.status_label.configure(text=f"✅ Ready (v{self.CURRENT_VERSION})"))
+
+    def on_update_checked(self, latest_version):
+        if latest_version > self.CURRENT_VERSION:
+            self.show_update_prompt(latest_version)
+        elif not self.scan_worker.busy:
+            self.status_label.configure(text=f"✅ Up to date (v{self.CURRENT_VERSION})")
+
+    def show_update_prompt(self, latest_version):
+        """Show update popup"""
+        popup = ctk.CTkToplevel(self)
+        popup.title("📢 Update Available!")
+        popup.geometry("400x180")
+        popup.resizable(False, False)
+        popup.transient(self)
+        popup.grab_set()
+
+        # Center popup
+        popup.update_idletasks()
+        x = self.winfo_x() + (self.winfo_width() // 2) - (popup.winfo_width() // 2)
+        y = self.winfo_y() + (self.winfo_height() // 2) - (popup.winfo_height() // 2)
+        popup.geometry(f"+{int(x)}+{int(y)}")
+
+        ctk.CTkLabel(popup, text=f"New Version {latest_version} Available!", font=("Helvetica", 16, "bold")).pack(pady=10)
+        ctk.CTkLabel(popup, text=f"You are on v{self.CURRENT_VERSION}", font=("Helvetica", 12)).pack(pady=5)
+
+        btn_frame = ctk.CTkFrame(popup, fg_color="transparent")
+        btn_frame.pack(pady=15)
+
+        ctk.CTkButton(
+            btn_frame,
+            text="📥 Download Now",
+            command=lambda: open_link("https://github.com/jigsthummar007/AutoRenamer/releases"),
+            fg_color="green"
+        ).pack(side="left", padx=5)
+
+        ctk.CTkButton(
+            btn_frame,
+            text="Later",
+            command=popup.destroy
+        ).pack(side="left", padx=5)
+
+        self.status_label.configure(text=f"🔔 Update v{latest_version} available!")    
+
+    def run_startup_wizard(self):
+        """Show setup guide on first run"""
+        if not self.first_run:
+            return
+
+        wizard = ctk.CTkToplevel(self)
+        wizard.title("🚀 Setup Wizard")
+        wizard.geometry("500x400")
+        wizard.resizable(False, False)
+        wizard.transient(self)
+        wizard.grab_set()
+
+        x = self.winfo_x() + (self.winfo_width() // 2) - 250
+        y = self.winfo_y() + (self.winfo_height() // 2) - 200
+        wizard.geometry(f"+{int(x)}+{int(y)}")
+
+        ctk.CTkLabel(wizard, text="Welcome to Auto File Renamer", font=TITLE_FONT).pack(pady=10)
+        ctk.CTkLabel(wizard, text="First-time setup guide:", font=FONT).pack(pady=(0, 10))
+
+        steps = [
+            "1. Click '📁 Select 2025 Folder' to set root",
+            "2. Your files will appear in the list",
+            "3. Click any file to preview rename",
+            "4. Use '🔧 Edit Keywords' to add 'layout', 'design', etc.",
+            "5. Click '✅ Rename' to process",
+            "6. Use '📁 Batch Rename' for multiple files"
+        ]
+
+        for step in steps:
+            ctk.CTkLabel(wizard, text=step, font=("Segoe UI", 11), anchor="w").pack(pady=2, padx=20, anchor="w")
+
+        def finish():
+            self.first_run = False
+            wizard.destroy()
+
+        ctk.CTkButton(wizard, text="Let's Go!", command=finish, height=40, font=FONT).pack(pady=20)
+
+    def create_backup(self):
+        """Backup config, parties.csv, keywords.json on a worker thread"""
+        threading.Thread(target=self._write_backup, daemon=True).start()
+
+    def _write_backup(self):
+        items = [
+            (self.config_file, "config.json"),
+            (codes_dir / "parties.csv", "parties.csv"),
+            (keywords_file, "keywords.json")
+        ]
+        try:
+            store = BackupStore(backup_dir, self.backup_keep, self.backup_keep_days)
+            if store.snapshot(items):
+                logging.info("Backup created")
+            else:
+                logging.info("Backup skipped: settings unchanged")
+        except Exception as e:
+            logging.warning(f"Backup failed: {e}")
+
+    def export_rename_log(self):
+        """Export rename history to CSV"""
+        if not self.history:
+            messagebox.showinfo("Export Log", "No rename history to export.")
+            return
+
+        file = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv")],
+            title="Save Rename Log"
+        )
+        if not file:
+            return
+
+        try:
+            with open(file, mode='w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(["Timestamp", "Original", "New Name"])
+                for item in self.history.iter_export():
+                    writer.writerow([item["timestamp"], item["old"], item["new"]])
+            messagebox.showinfo("Success", f"Rename log exported to:\n{file}")
+        except Exception as e:
+            messagebox.showerror("Export Failed", str(e))
+
+    def load_keywords(self):
+        """Load quantity keywords from config/keywords.json"""
+        if keywords_file.exists():
+            try:
+                self.quantity_keywords = read_quantity_keywords(keywords_file)
+            except Exception as e:
+                logging.warning(f"Failed to load keywords: {e}")
+                self.quantity_keywords = DEFAULT_KEYWORDS
+        else:
+            self.quantity_keywords = DEFAULT_KEYWORDS
+            self.save_keywords()
+        self.naming.set_keywords(self.quantity_keywords)
+        self.plan_config_changed()
+
+    def save_keywords(self):
+        """Save keywords to file"""
+        self.naming.set_keywords(self.quantity_keywords)
+        self.plan_config_changed()
+        try:
+            with open(keywords_file, "w", encoding="utf-8") as f:
+                json.dump({"quantity_keywords": self.quantity_keywords}, f, indent=2)
+        except Exception as e:
+            logging.error(f"Failed to save keywords: {e}")
+
+    def open_keywords_editor(self):
+        """Open UI to edit quantity keywords"""
+        popup = ctk.CTkToplevel(self)
+        popup.title("🔧 Edit Quantity Keywords")
+        popup.geometry("500x400")
+        popup.resizable(False, False)
+        popup.transient(self)
+        popup.grab_set()
+
+        x = self.winfo_x() + (self.winfo_width() // 2) - 250
+        y = self.winfo_y() + (self.winfo_height() // 2) - 200
+        popup.geometry(f"+{int(x)}+{int(y)}")
+
+        ctk.CTkLabel(popup, text="Manage Quantity Keywords", font=TITLE_FONT).pack(pady=10)
+
+        list_frame = ctk.CTkScrollableFrame(popup, height=200)
+        list_frame.pack(pady=10, padx=20, fill="both", expand=True)
+
+        keyword_vars = []
+        delete_btns = []
+
+        def refresh_list():
+            for var, btn in zip(keyword_vars, delete_btns):
+                var.destroy()
+                btn.destroy()
+            keyword_vars.clear()
+            delete_btns.clear()
+
+            for kw in self.quantity_keywords:
+                inner_frame = ctk.CTkFrame(list_frame, fg_color="transparent")
+                inner_frame.pack(fill="x", pady=2)
+
+                var = ctk.CTkLabel(inner_frame, text=kw, font=CODE_FONT, width=100, anchor="w")
+                var.pack(side="left", padx=(0, 10))
+                keyword_vars.append(var)
+
+                btn = ctk.CTkButton(
+                    inner_frame,
+                    text="🗑️",
+                    width=40,
+                    height=28,
+                    fg_color="#d42222",
+                    hover_color="#a00",
+                    command=lambda k=kw: remove_keyword(k, popup)
+                )
+                btn.pack(side="right")
+                delete_btns.append(btn)
+
+        def remove_keyword(kw, win):
+            self.quantity_keywords.remove(kw)
+            refresh_list()
+
+        def add_keyword():
+            new_kw = add_entry.get().strip().lower()
+            if new_kw and new_kw not in self.quantity_keywords:
+                self.quantity_keywords.append(new_kw)
+                add_entry.delete(0, "end")
+                refresh_list()
+
+        def save_and_close():
+            self.save_keywords()
+            popup.destroy()
+            self.status_label.configure(text=f"✅ Keywords updated: {len(self.quantity_keywords)} active")
+
+        def reset_default():
+            self.quantity_keywords = DEFAULT_KEYWORDS.copy()
+            refresh_list()
+
+        refresh_list()
+
+        add_frame = ctk.CTkFrame(popup)
+        add_frame.pack(pady=10, padx=20, fill="x")
+        ctk.CTkLabel(add_frame, text="Add New:").pack(side="left")
+        add_entry = ctk.CTkEntry(add_frame, placeholder_text="e.g., layout, design")
+        add_entry.pack(side="left", fill="x", expand=True, padx=5)
+        ctk.CTkButton(add_frame, text="Add", command=add_keyword).pack(side="left")
+
+        btn_frame = ctk.CTkFrame(popup, fg_color="transparent")
+        btn_frame.pack(pady=10)
+        ctk.CTkButton(btn_frame, text="💾 Save & Close", command=save_and_close).pack(side="left", padx=5)
+        ctk.CTkButton(btn_frame, text="🔄 Reset", command=reset_default).pack(side="left", padx=5)
+
+        popup.bind("<Return>", lambda e: add_keyword())
+        popup.focus()
+
+    def extract_dimensions(self, filename: str) -> str:
+        """Extract dimensions and convert to feet using custom bucket rules"""
+        return self.naming.extract_dimensions(filename)
+
+    def detect_quantity(self, filename: str) -> int:
+        """Detect quantity only from numbers adjacent to keywords"""
+        return self.naming.detect_quantity(filename)
+
+    def generate_new_filename(self, original_stem: str, party_code: str, extension: str, dim_str: str = "") -> str:
+        return self.naming.generate_new_filename(original_stem, party_code, extension, dim_str, self.machine_var.get())
+
+    def update_preview(self):
+        if not self.selected_file or not self.selected_file.exists():
+            self.preview_label.configure(text="Preview: --", text_color="gray")
+            return
+        entry = self.rename_plan.get(self.selected_file)
+        if not entry or not entry["target"]:
+            stem = self.selected_file.stem
+            ext = self.selected_file.suffix
+            new_name = self.generate_new_filename(stem, "?", ext, entry["ft"] if entry else "")
+            self.preview_label.configure(text=f"Preview: {new_name}", text_color="red")
+        elif entry["duplicate"]:
+            self.preview_label.configure(text=f"Preview: {entry['final'].name} ⚠️ identical file already in Done", text_color="orange")
+        elif entry["collision"]:
+            self.preview_label.configure(text=f"Preview: {entry['final'].name} ⚠️ name taken in Done", text_color="orange")
+        else:
+            self.preview_label.configure(text=f"Preview: {entry['target']}", text_color="lightgreen")
+
+    def plan_config_changed(self):
+        """Replan every listed file if the party map, keywords or machine changed"""
+        if self.rename_plan.configure(self.party_map, self.naming, self.machine_var.get()):
+            if not self.file_model.finalize:
+                self.rename_plan.rebuild(self.file_path_list)
+            if self.selected_file:
+                self.update_preview()
+
+    def on_plan_updated(self, planned):
+        """Background plan results arrived: redraw collision marks and the preview"""
+        self.file_listbox.refresh()
+        if self.selected_file:
+            self.update_preview()
+
+    def select_folder(self):
+        try:
+            folder = filedialog.askdirectory(title="Select Year Folder (e.g. 2025)")
+            if not folder: return
+            path = Path(folder)
+            if not path.is_dir(): return
+            self.selected_root = path
+            self.last_folder = str(folder)
+            self.save_config()
+            self.scan_folder()
+            self.start_auto_scan()
+            self.status_label.configure(text=f"📁 Active: {path.name}")
+        except Exception as e:
+            self.status_label.configure(text="❌ Folder selection failed")
+            messagebox.showerror("Error", f"Could not open folder:\n{e}")
+
+    def scan_folder(self):
+        """Start a background scan; a newer scan always supersedes this one"""
+        if self.scan_span:
+            self.scan_span.finish(cancelled=True)
+            self.scan_span = None
+        if not self.selected_root:
+            self.scan_worker.cancel()
+            self.filtered_file_list = []
+            self.file_listbox.set_items(self.filtered_file_list, header="❌ Root folder not found.")
+            return
+        root = self.selected_root
+        in_done = self.show_done_var.get()
+        extensions = self.allowed_extensions
+        self.file_model.reset(root, in_done, [])
+        self.events_during_scan = []
+        self.scan_found = 0
+        if in_done:
+            self.select_all_btn.grid_remove()
+        else:
+            self.select_all_btn.grid()
+        mode = "Finalize Mode" if in_done else "New Files"
+        self.filtered_file_list = []
+        self.file_listbox.set_items(self.filtered_file_list, header=f"📁 {mode} | Files:")
+        self.status_label.configure(text=f"⏳ Scanning {root.name}...")
+        self.scan_span = self.perf.span("scan", root=str(root), mode="finalize" if in_done else "new")
+        stats = self.scan_stats = {}
+        def make_iter(cancel):
+            # Checked on the worker: a stat of a dead network share can hang
+            if not root.is_dir():
+                raise FileNotFoundError(f"Root folder not found: {root}")
+            return self.file_index.iter_scan(root, extensions, in_done, cancel, stats)
+
+        self.scan_worker.start(make_iter)
+
+    def on_scan_batch(self, batch):
+        """Show files from a running scan as they are found"""
+        t0 = time.perf_counter()
+        if not self.search_var.get().strip():
+            self.filtered_file_list.extend(batch)
+            self.file_listbox.refresh()
+        self.scan_found += len(batch)
+        self.status_label.configure(text=f"⏳ Scanning... {self.scan_found} files found")
+        if self.scan_span:
+            self.scan_span.add("batches")
+            self.scan_span.add_ms("ui_ms", t0)
+
+    def on_scan_done(self, files):
+        t0 = time.perf_counter()
+        self.file_model.reset(self.file_model.root, self.file_model.finalize, files)
+        if self.events_during_scan:
+            self.file_model.apply(self.events_during_scan)
+            self.events_during_scan = []
+        self.render_file_list(keep_position=False)
+        self.rename_plan.rebuild([] if self.file_model.finalize else self.file_path_list)
+        if self.scan_span:
+            self.scan_span.add_ms("ui_ms", t0)
+            self.scan_span.finish(files=len(files), **self.scan_stats)
+            self.scan_span = None
+        self.mark_startup("interactive")
+
+    def on_scan_error(self, error):
+        if isinstance(error, FileNotFoundError):
+            self.file_listbox.set_items(self.filtered_file_list, header="❌ Root folder not found.")
+        self.status_label.configure(text=f"❌ Scan error: {error}")
+        if self.scan_span:
+            self.scan_span.finish(error=str(error), **self.scan_stats)
+            self.scan_span = None
+        self.mark_startup("interactive")
+
+    @property
+    def file_path_list(self):
+        return self.file_model.paths
+
+    def format_file_row(self, file_path):
+        """List row text, built only for rows on screen"""
+        if self.file_model.finalize:
+            return f"? | Done | {file_path.name}"
+        party = file_path.parent.name
+        entry = self.rename_plan.entries.get(file_path)
+        mark = " ⚠️" if entry and entry["collision"] else ""
+        return f"{self.party_map.get(party, '?')} | {party} | {file_path.name}{mark}"
+
+    def render_file_list(self, keep_position=True):
+        """Point the list view at the in-memory model"""
+        if self.search_var.get().strip():
+            self.on_search_change()
+            return
+        mode = "Finalize Mode" if self.file_model.finalize else "New Files"
+        self.filtered_file_list = self.file_path_list[:]
+        self.file_listbox.set_items(self.filtered_file_list, header=f"📁 {mode} | Files:", keep_position=keep_position)
+        self.status_label.configure(text=f"✅ {mode}: {len(self.file_path_list)} files")
+
+    def apply_moves(self, moves):
+        """Reflect our own (src, dst) moves in the file list without a rescan"""
+        if moves:
+            self.apply_file_events([("moved", str(src), str(dst), False) for src, dst in moves])
+
+    def apply_file_events(self, events):
+        """Apply a debounced batch of watchdog events instead of rescanning"""
+        try:
+            if self.scan_worker.busy:
+                # Replayed on top of the finished scan in on_scan_done
+                self.events_during_scan.extend(events)
+                return
+            with self.perf.span("file_events", events=len(events)) as span:
+                changed = self.file_model.apply(events)
+                self.replan_for_events(events)
+                if changed:
+                    t0 = time.perf_counter()
+                    self.render_file_list()
+                    span.add_ms("ui_ms", t0)
+                span.set(changed=bool(changed))
+            logging.info(f"Auto-scan: applied {len(events)} file events")
+        except Exception as e:
+            self.status_label.configure(text=f"❌ Auto-scan error: {e}")
+
+    def replan_for_events(self, events):
+        """Invalidate the rename plan of party folders touched by file events"""
+        if self.file_model.finalize:
+            return
+        if any(is_dir for _, _, _, is_dir in events):
+            self.rename_plan.rebuild(self.file_path_list)
+            return
+        folders = set()
+        for _, src, dest, _ in events:
+            for path in (src, dest):
+                if path:
+                    parent = Path(path).parent
+                    folders.add(parent.parent if is_done_folder(parent.name) else parent)
+        files = [p for p in self.file_path_list if p.parent in folders]
+        self.rename_plan.invalidate(folders, files)
+
+    def search_text(self, file_path):
+        """Lowercase text a search query is matched against: name, party, code"""
+        party_dir = file_path.parent.parent if self.file_model.finalize else file_path.parent
+        code = self.party_map.get(party_dir.name, "")
+        return f"{file_path.name}\n{party_dir.name}\n{code}".lower()
+
+    def on_search_typed(self, *args):
+        """Debounce keystrokes: only the last one within the window searches"""
+        if self.search_after_id:
+            self.after_cancel(self.search_after_id)
+        self.search_after_id = self.after(SEARCH_DEBOUNCE_MS, self.on_search_change)
+
+    def on_search_change(self, *args):
+        self.search_after_id = None
+        query = self.search_var.get().strip().lower()
+        if not query:
+            self.render_file_list(keep_position=False)
+            return
+        with self.perf.span("search", query_len=len(query), files=len(self.file_path_list)) as span:
+            self.filtered_file_list = self.search_index.search(query, self.file_path_list)
+            span.add_ms("search_ms", span.t0)
+            t0 = time.perf_counter()
+            self.file_listbox.set_items(self.filtered_file_list, header="Search Results:")
+            span.add_ms("ui_ms", t0)
+            span.set(results=len(self.filtered_file_list))
+        self.status_label.configure(text=f"🔍 Found {len(self.filtered_file_list)} matching files")
+
+    def on_file_click(self, file_index):
+        try:
+            if file_index < 0 or file_index >= len(self.filtered_file_list): return
+            selected_path = self.filtered_file_list[file_index]
+            if not selected_path.exists(): return
+            self.selected_file = selected_path
+            if self.show_done_var.get():
+                self.open_finalize_grid(selected_path)
+                return
+            self.file_label.configure(text=f"Selected: {selected_path.name}")
+            self.update_preview()
+            self.status_label.configure(text=f"📁 {selected_path.parent.name} | Ready")
+        except Exception as e:
+            self.status_label.configure(text=f"❌ Click error: {e}")
+
+    def open_finalize_grid(self, focus=None):
+        """Edit Qty/Cat of every Done file in one grid and finalize them as one batch"""
+        if self.scan_worker.busy:
+            self.status_label.configure(text="⏳ Scan in progress, try again when it finishes")
+            return
+        if self.batch_busy():
+            return
+        files = [p for p in self.filtered_file_list if "[ok]" not in p.name]
+        if not files:
+            self.status_label.configure(text="⚠️ Finalize: no files to finalize")
+            return
+        machine = self.machine_var.get()
+
+        popup = ctk.CTkToplevel(self)
+        popup.title("✏️ Finalize Files")
+        popup.geometry("960x600")
+        popup.transient(self)
+        popup.grab_set()
+        x = self.winfo_x() + (self.winfo_width() // 2) - 480
+        y = self.winfo_y() + (self.winfo_height() // 2) - 300
+        popup.geometry(f"+{int(x)}+{int(y)}")
+
+        def with_preview(row_id, values):
+            file_path = files[int(row_id)]
+            # "premium" or "%6%" become the category code that goes into the name
+            if values[2]:
+                values[2] = self.categories.resolve(values[2]) or values[2]
+            values[3] = finalized_filename(file_path.stem, file_path.suffix, values[1], values[2], machine)
+            return values
+
+        def validate(values):
+            qty = values[1]
+            if not qty.isdigit() or int(qty) < 1:
+                return "Quantity must be ≥ 1"
+            if values[2] and len(self.categories) and self.categories.resolve(values[2]) is None:
+                return f"Unknown category '{values[2]}' (see codes/categories.csv)"
+            return None
+
+        grid = EditableGrid(
+            popup,
+            columns=[("file", "File", 360, False), ("qty", "Qty", 70, True),
+                     ("cat", "Cat", 80, True), ("new", "New Name", 400, False)],
+            validate=validate, on_change=with_preview,
+            completers={"cat": lambda text: self.categories.complete(text)}, font=FONT
+        )
+        self.finalize_grid = grid
+        rows = []
+        for i, file_path in enumerate(files):
+            qty = str(quantity_token(file_path.stem))
+            rows.append((str(i), [file_path.name, qty, "", finalized_filename(file_path.stem, file_path.suffix, qty, "", machine)]))
+        grid.set_rows(rows)
+
+        # --- Bulk edit: apply Qty and/or Cat to the selected rows ---
+        bulk = ctk.CTkFrame(popup, fg_color="transparent")
+        bulk.pack(fill="x", padx=12, pady=(12, 6))
+        ctk.CTkLabel(bulk, text="Qty:").pack(side="left", padx=5)
+        qty_var = ctk.StringVar()
+        ctk.CTkEntry(bulk, textvariable=qty_var, width=60).pack(side="left", padx=5)
+        ctk.CTkLabel(bulk, text="Cat:").pack(side="left", padx=5)
+        cat_var = ctk.StringVar()
+        ctk.CTkEntry(bulk, textvariable=cat_var, width=60).pack(side="left", padx=5)
+
+        def apply_to_selected():
+            selected = grid.selection()
+            if not selected:
+                return
+            if qty_var.get().strip():
+                grid.set_column("qty", qty_var.get().strip(), selected)
+            cat = cat_var.get().strip()
+            if cat:
+                if len(self.categories) and self.categories.resolve(cat) is None:
+                    messagebox.showwarning("Invalid", f"Unknown category '{cat}'", parent=popup)
+                    return
+                grid.set_column("cat", cat, selected)
+            update_summary()
+
+        ctk.CTkButton(bulk, text="Apply to Selected", command=apply_to_selected, width=140).pack(side="left", padx=10)
+        ctk.CTkLabel(bulk, text="Double-click a Qty/Cat cell to edit · Enter moves down · Tab moves right",
+                     font=SMALL_FONT, text_color="gray").pack(side="right", padx=5)
+
+        grid.pack(fill="both", expand=True, padx=12)
+        summary = ctk.CTkLabel(popup, text="", font=FONT)
+        summary.pack(pady=(6, 0))
+
+        def update_summary():
+            invalid = len(grid.errors)
+            text = f"{len(files)} files"
+            if invalid:
+                text += f" · ❌ {invalid} invalid"
+            summary.configure(text=text, text_color="red" if invalid else "lightgreen")
+
+        grid.tree.bind("<<TreeviewSelect>>", lambda e: update_summary(), add="+")
+        update_summary()
+
+        def commit():
+            if self.batch_running:
+                messagebox.showwarning("Finalize", "A batch is still running, try again when it finishes.", parent=popup)
+                return
+            grid.revalidate()
+            update_summary()
+            if grid.errors:
+                row_id, error = next(iter(grid.errors.items()))
+                grid.focus_row(row_id)
+                messagebox.showwarning("Invalid", f"{files[int(row_id)].name}:\n{error}", parent=popup)
+                return
+            tasks = []
+            for row_id, values in grid.rows():
+                file_path = files[int(row_id)]
+                if values[3] != file_path.name:
+                    tasks.append((file_path, values[3]))
+            popup.destroy()
+            if not tasks:
+                self.status_label.configure(text="⚠️ Finalize: nothing to change")
+                return
+            try:
+                txn = BatchTransaction.begin(self.batch_txn_dir, tasks, in_place=True)
+            except OSError as e:
+                messagebox.showerror("Finalize", f"Could not record the batch plan:\n{e}")
+                return
+            self.run_batch(txn, list(range(len(tasks))), [])
+
+        btn_frame = ctk.CTkFrame(popup, fg_color="transparent")
+        btn_frame.pack(pady=10)
+        ctk.CTkButton(btn_frame, text="✅ Finalize All", command=commit, width=140, fg_color="green").pack(side="left", padx=5)
+        ctk.CTkButton(btn_frame, text="Cancel", command=popup.destroy, width=100).pack(side="left", padx=5)
+        popup.bind("<Escape>", lambda e: popup.destroy())
+
+        if focus is not None and focus in files:
+            row_id = str(files.index(focus))
+            grid.focus_row(row_id)
+            grid.edit(row_id, 1)
+        else:
+            grid.focus_row("0")
+
+    def rename_file(self):
+        if not self.selected_file: return
+        machine = self.machine_var.get()
+        if not machine: return
+        file_path = self.selected_file
+        if not file_path.exists(): return
+        # A plot without a size in its name and no plan entry yet is measured on its own
+        if self.rename_plan.when_measured(file_path, lambda: self.rename_planned(file_path)):
+            self.status_label.configure(text="⏳ Reading plot size...")
+
+    def rename_planned(self, file_path):
+        if file_path != self.selected_file or not file_path.exists(): return
+        entry = self.rename_plan.get(file_path)
+        new_name = entry["target"] if entry else None
+        if not new_name:
+            self.status_label.configure(text=f"⚠️ No party code for '{file_path.parent.name}'")
+            return
+        try:
+            final_path = move_to_done(file_path, new_name)
+            self.history.add(file_path, final_path)
+            self.status_label.configure(text=f"✅ Renamed: {final_path.name}")
+            self.apply_moves([(file_path, final_path)])
+            self.selected_file = None
+            self.file_label.configure(text="No file selected")
+            self.preview_label.configure(text="Preview: --", text_color="gray")
+        except Exception as e:
+            self.status_label.configure(text=f"❌ Error: {e}")
+
+    def select_all_files(self):
+        if self.show_done_var.get():
+            self.open_finalize_grid()
+            return
+        if not self.filtered_file_list: return
+        if self.scan_worker.busy:
+            self.status_label.configure(text="⏳ Scan in progress, try again when it finishes")
+            return
+        if self.batch_busy():
+            return
+        machine = self.machine_var.get()
+        if not machine: return
+        # The background plan is current for every file not touched since it was built
+        self.plan_config_changed()
+        # Names may use plot sizes read in the background: wait until every file is planned
+        self.batch_running = True
+        self.select_all_btn.configure(state="disabled")
+        self.status_label.configure(text="⏳ Batch: finishing the rename plan...")
+        self.rename_plan.when_planned(self.filtered_file_list, self.confirm_batch)
+
+    def confirm_batch(self):
+        self.status_label.configure(text="Ready")
+        if not self.start_batch():
+            self.batch_running = False
+            self.select_all_btn.configure(state="normal")
+
+    def start_batch(self) -> bool:
+        """Confirm the batch and start it; False if it was not started"""
+        question = "Rename all files?"
+        duplicates = self.rename_plan.duplicates(self.filtered_file_list)
+        if duplicates:
+            question += f"\n\n⚠️ {len(duplicates)} files are identical to a file already in Done and will be stored as ' (n)' copies."
+        confirm = messagebox.askyesno("Confirm", question)
+        if not confirm: return False
+        tasks, skipped = self.rename_plan.tasks(self.filtered_file_list)
+        if not tasks:
+            self.status_label.configure(text=f"⚠️ Batch: nothing to rename ({len(skipped)} without party code)")
+            return False
+        try:
+            txn = BatchTransaction.begin(self.batch_txn_dir, tasks)
+        except OSError as e:
+            messagebox.showerror("Batch Rename", f"Could not record the batch plan:\n{e}")
+            return False
+        self.run_batch(txn, list(range(len(tasks))), skipped)
+        return True
+
+    def batch_busy(self) -> bool:
+        """True, with a status note, while a batch rename, finalize or undo runs"""
+        if self.batch_running:
+            self.status_label.configure(text="⏳ A batch is still running, try again when it finishes")
+        return self.batch_running
+
+    def run_batch(self, txn, indexes, skipped):
+        """Run the given plan indexes of a transaction on the batch executor"""
+        tasks = [txn.tasks[i] for i in indexes]
+        op = "finalize" if txn.in_place else "batch_rename"
+        span = self.perf.span(op, files=len(tasks))
+        stats = {}
+        executor = self.finalize_executor if txn.in_place else self.batch_executor
+        self.batch_running = True
+        self.select_all_btn.configure(state="disabled")
+        self.status_label.configure(text=f"⏳ Batch: 0/{len(tasks)} renamed...")
+
+        def on_result(k, result):
+            if result["error"]:
+                txn.mark_failed(indexes[k], result["error"])
+            else:
+                txn.mark_applied(indexes[k], result["new"])
+
+        def work():
+            try:
+                executor.run(
+                    tasks,
+                    on_progress=lambda done, total: self.after(0, self.on_batch_progress, done, total),
+                    on_result=on_result,
+                    on_intent=txn.mark_intent,
+                    stats=stats
+                )
+            except Exception as e:
+                logging.error(f"Batch {txn.batch_id} stopped: {e}")
+            finally:
+                span.set(**stats)
+                # Files not reached are reported as "Not processed"
+                self.after(0, self.on_batch_done, txn, skipped, span)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def on_batch_progress(self, done, total):
+        self.status_label.configure(text=f"⏳ Batch: {done}/{total} renamed...")
+
+    def on_batch_done(self, txn, skipped, span):
+        """Record a finished batch in history, close its transaction and show the report"""
+        self.batch_running = False
+        self.select_all_btn.configure(state="normal")
+        results = txn.results()
+        renamed = [r for r in results if not r["error"]]
+        failed = [r for r in results if r["error"]]
+        if not self.history.has_batch(txn.batch_id):
+            for r in renamed:
+                self.history.add(r["old"], r["new"], batch=txn.batch_id)
+            self.history.sync()
+        txn.finish()
+        log_batch_summary(
+            "Batch", {"renamed": len(renamed), "failed": len(failed), "skipped": len(skipped)},
+            [f"{r['old'].name}: {r['error']}" for r in failed], batch_id=txn.batch_id
+        )
+        t0 = time.perf_counter()
+        self.apply_moves([(r["old"], r["new"]) for r in renamed])
+        span.add_ms("ui_ms", t0)
+        span.finish(renamed=len(renamed), failed=len(failed), skipped=len(skipped))
+        self.status_label.configure(
+            text=f"✅ Batch: {len(renamed)} renamed, {len(failed)} failed, {len(skipped)} skipped"
+        )
+        self.show_batch_report(results, skipped)
+        if txn.recovered:
+            # Other interrupted batches wait until this one is done
+            self.after(0, self.recover_unfinished_batch)
+
+    def show_batch_report(self, results, skipped):
+        """Per-file outcome of a batch rename"""
+        lines = []
+        for r in results:
+            if r["error"]:
+                lines.append(f"❌ {r['old'].name}: {r['error']}")
+        for file_path in skipped:
+            lines.append(f"⚠️ {file_path.name}: no party code for '{file_path.parent.name}'")
+        for r in results:
+            if not r["error"]:
+                lines.append(f"✅ {r['old'].name} → {r['new'].name}")
+
+        popup = ctk.CTkToplevel(self)
+        popup.title("📋 Batch Report")
+        popup.geometry("700x450")
+        popup.transient(self)
+        failed = sum(1 for r in results if r["error"])
+        summary = f"{len(results) - failed} renamed, {failed} failed, {len(skipped)} skipped"
+        ctk.CTkLabel(popup, text=summary, font=TITLE_FONT).pack(pady=10)
+        report = ctk.CTkTextbox(popup, font=CODE_FONT, wrap="none")
+        report.pack(fill="both", expand=True, padx=12)
+        report.insert("0.0", "\n".join(lines))
+        report.configure(state="disabled")
+        ctk.CTkButton(popup, text="Close", width=100, command=popup.destroy).pack(pady=10)
+
+    def recover_unfinished_batch(self):
+        """Roll interrupted batches forward or back, one at a time"""
+        if self.batch_running:
+            return
+        for path in BatchTransaction.unfinished(self.batch_txn_dir):
+            if path in self.deferred_batches:
+                continue
+            try:
+                txn = BatchTransaction.recover(path)
+            except Exception as e:
+                logging.error(f"Batch recovery failed for {path.name}: {e}")
+                continue
+            if not txn:
+                continue
+            pending = txn.pending()
+            answer = messagebox.askyesnocancel(
+                "Unfinished Batch",
+                f"A batch rename of {len(txn.tasks)} files was interrupted.\n"
+                f"{len(txn.applied)} done, {len(pending)} still pending.\n\n"
+                "Yes → finish the batch\n"
+                "No → undo the files already renamed\n"
+                "Cancel → decide on next start"
+            )
+            if answer is None:
+                txn.close()
+                self.deferred_batches.add(path)
+            elif answer:
+                logging.info(f"Rolling batch {txn.batch_id} forward: {len(pending)} pending")
+                self.run_batch(txn, pending, [])
+                return
+            else:
+                restored, errors = txn.roll_back()
+                log_batch_summary("Roll back", {"restored": restored, "failed": len(errors)}, errors, batch_id=txn.batch_id)
+                self.scan_folder()
+                self.status_label.configure(text=f"↩ Batch rolled back: {restored} restored, {len(errors)} failed")
+                if errors:
+                    messagebox.showerror("Roll Back", "\n".join(errors[:20]))
+
+    def undo_all_batch(self):
+        """Undo every rename, or one batch, on the parallel undo executor"""
+        if self.batch_busy():
+            return
+        if not self.history:
+            messagebox.showinfo("Undo", "Nothing to undo.")
+            return
+        scope = self.ask_undo_scope()
+        if scope is None:
+            return
+        items = self.history.take_all() if scope == "all" else self.history.take_batch(scope)
+        self.history.sync()
+        tasks = plan_undo(items)
+        if not tasks:
+            self.status_label.configure(text="↩ Undo All: nothing to restore")
+            return
+        self.batch_running = True
+        self.undo_all_btn.configure(state="disabled")
+        self.status_label.configure(text=f"⏳ Undo: 0/{len(tasks)} restored...")
+        span = self.perf.span("undo", scope="all" if scope == "all" else "batch", files=len(tasks))
+        stats = {}
+        results = [None] * len(tasks)
+
+        def on_result(i, result):
+            results[i] = result
+
+        def work():
+            try:
+                self.undo_executor.run(
+                    tasks,
+                    on_progress=lambda done, total: self.after(0, self.on_undo_progress, done, total),
+                    on_result=on_result,
+                    stats=stats
+                )
+            except Exception as e:
+                logging.error(f"Undo stopped: {e}")
+            finally:
+                span.set(**stats)
+                self.after(0, self.on_undo_done, tasks, results, span)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def ask_undo_scope(self):
+        """Ask whether to undo everything or a single batch; returns "all", a batch id or None"""
+        batches = self.history.batches()
+        if not batches:
+            confirm = messagebox.askyesno("Undo All", "Undo ALL renames from this session?")
+            return "all" if confirm else None
+
+        popup = ctk.CTkToplevel(self)
+        popup.title("↩ Undo")
+        popup.geometry("420x200")
+        popup.resizable(False, False)
+        popup.transient(self)
+        popup.grab_set()
+        x = self.winfo_x() + (self.winfo_width() // 2) - 210
+        y = self.winfo_y() + (self.winfo_height() // 2) - 100
+        popup.geometry(f"+{int(x)}+{int(y)}")
+
+        options = {"All renames": "all"}
+        for batch, count, timestamp in batches:
+            options[f"Batch {timestamp} ({count} files)"] = batch
+        choice_var = ctk.StringVar(value=list(options)[0])
+        result = {"scope": None}
+
+        ctk.CTkLabel(popup, text="What should be undone?", font=TITLE_FONT).pack(pady=10)
+        ctk.CTkOptionMenu(popup, values=list(options), variable=choice_var, width=340).pack(pady=8)
+
+        def submit():
+            result["scope"] = options[choice_var.get()]
+            popup.destroy()
+
+        btn_frame = ctk.CTkFrame(popup, fg_color="transparent")
+        btn_frame.pack(pady=12)
+        ctk.CTkButton(btn_frame, text="↩ Undo", command=submit, width=90, fg_color="red").pack(side="left", padx=5)
+        ctk.CTkButton(btn_frame, text="Cancel", command=popup.destroy, width=90).pack(side="left", padx=5)
+        popup.bind("<Escape>", lambda e: popup.destroy())
+        self.wait_window(popup)
+        return result["scope"]
+
+    def on_undo_progress(self, done, total):
+        self.status_label.configure(text=f"⏳ Undo: {done}/{total} restored...")
+
+    def on_undo_done(self, tasks, results, span):
+        self.batch_running = False
+        self.undo_all_btn.configure(state="normal")
+        moves = []
+        errors = []
+        for (old_path, current_path), r in zip(tasks, results):
+            if r is None:
+                errors.append(f"{current_path.name}: Not processed")
+            elif r["error"]:
+                errors.append(f"{current_path.name}: {r['error']}")
+            else:
+                moves.append((current_path, old_path))
+        failed = len(errors)
+        log_batch_summary("Undo", {"restored": len(moves), "failed": failed}, errors)
+        t0 = time.perf_counter()
+        self.apply_moves(moves)
+        span.add_ms("ui_ms", t0)
+        span.finish(restored=len(moves), failed=failed)
+        self.status_label.configure(text=f"↩ Undo All: {len(moves)} files restored, {failed} failed")
+
+    def undo_rename(self):
+        item = self.history.undo()
+        if not item: return
+        try:
+            src = Path(item["new"])
+            dst = restore_file(Path(item["old"]), src)
+            self.status_label.configure(text=f"↩ Undo: {dst.name}")
+            self.apply_moves([(src, dst)])
+        except Exception as e:
+            self.status_label.configure(text=f"❌ Undo failed: {e}")
+
+    def redo_rename(self):
+        item = self.history.redo()
+        if not item: return
+        try:
+            src = Path(item["old"])
+            target = Path(item["new"])
+            if target.parent == src.parent:
+                # Finalize renames stay inside Done
+                dst = restore_file(target, src)
+            else:
+                dst = move_to_done(src, target.name)
+            self.status_label.configure(text=f"⟳ Redo: {dst.name}")
+            self.apply_moves([(src, dst)])
+        except Exception as e:
+            self.status_label.configure(text=f"❌ Redo failed: {e}")
+
+    def load_parties_csv(self, refresh=True):
+        csv_path = codes_dir / "parties.csv"
+        if not csv_path.exists():
+            try:
+                create_default_parties_csv(csv_path)
+                self.status_label.configure(text=f"✅ Created default CSV: {csv_path.name}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to create CSV: {e}")
+                self.party_map = PartyMap()
+                return
+        try:
+            self.parties_signature = self.file_signature(csv_path)
+            old_map = self.party_map
+            self.party_map = PartyMap(read_party_map(csv_path), fuzzy=self.party_fuzzy)
+            if refresh:
+                self.refresh_party_codes(old_map)
+            else:
+                self.plan_config_changed()
+        except Exception as e:
+            self.status_label.configure(text="❌ Failed to load CSV")
+            messagebox.showerror("Error", f"Failed to load parties.csv:\n{e}")
+
+    @staticmethod
+    def file_signature(path):
+        try:
+            st = path.stat()
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def watch_code_files(self):
+        """Reload parties.csv / categories.csv when their mtime or size changes"""
+        try:
+            signature = self.file_signature(codes_dir / "parties.csv")
+            if signature is not None and signature != self.parties_signature:
+                logging.info("parties.csv changed on disk, reloading")
+                self.load_parties_csv()
+            signature = self.file_signature(codes_dir / "categories.csv")
+            if signature != self.categories_signature:
+                logging.info("categories.csv changed on disk, reloading")
+                self.load_categories_csv()
+        finally:
+            self.after(CODES_POLL_MS, self.watch_code_files)
+
+    def load_categories_csv(self):
+        """Index categories.csv; without it, finalize accepts any category as before"""
+        csv_path = codes_dir / "categories.csv"
+        self.categories_signature = self.file_signature(csv_path)
+        try:
+            self.categories = CategoryIndex(read_categories(csv_path) if csv_path.exists() else {})
+        except Exception as e:
+            logging.error(f"Failed to load categories.csv: {e}")
+            self.status_label.configure(text="❌ Failed to load categories.csv")
+            return
+        if self.finalize_grid is not None and self.finalize_grid.winfo_exists():
+            self.finalize_grid.revalidate()
+        logging.info(f"Categories loaded: {len(self.categories)}")
+
+    def refresh_party_codes(self, old_map):
+        """Update the code column of rows whose party code changed, no rescan"""
+        finalize = self.file_model.finalize
+        by_party = {}
+        for path in self.file_path_list:
+            party_dir = path.parent.parent if finalize else path.parent
+            by_party.setdefault(party_dir.name, []).append(path)
+        changed = [name for name in by_party if old_map.get(name) != self.party_map.get(name)]
+        changed_files = []
+        for name in changed:
+            for path in by_party[name]:
+                self.search_index.add(path)
+            changed_files.extend(by_party[name])
+        if finalize:
+            self.plan_config_changed()
+        else:
+            self.rename_plan.swap_party_map(self.party_map, {p.parent for p in changed_files}, changed_files)
+        if changed:
+            if self.search_var.get().strip():
+                self.on_search_change()
+            else:
+                self.file_listbox.refresh()
+            self.update_preview()
+        self.status_label.configure(text=f"✅ Parties reloaded: {len(self.party_map)} codes, {len(changed)} folders updated")
+        logging.info(f"Parties reloaded: {len(changed)} party folders changed code")
+
+    def load_config(self):
+        try:
+            with open(self.config_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                self.last_folder = data.get("last_folder", "")
+                self.batch_workers = data.get("batch_workers", DEFAULT_WORKERS)
+                self.backup_keep = data.get("backup_keep", KEEP_SNAPSHOTS)
+                self.backup_keep_days = data.get("backup_keep_days", KEEP_DAYS)
+                self.party_fuzzy = data.get("party_fuzzy_match", False)
+                self.check_duplicates = data.get("check_duplicates", False)
+                self.read_plot_size = data.get("read_plot_size", True)
+        except Exception:
+            self.last_folder = ""
+
+    def save_config(self):
+        try:
+            with open(self.config_file, "w", encoding="utf-8") as f:
+                json.dump({
+                    "last_folder": self.last_folder,
+                    "batch_workers": self.batch_workers,
+                    "backup_keep": self.backup_keep,
+                    "backup_keep_days": self.backup_keep_days,
+                    "party_fuzzy_match": self.party_fuzzy,
+                    "check_duplicates": self.check_duplicates,
+                    "read_plot_size": self.read_plot_size
+                }, f, indent=2)
+        except Exception as e:
+            logging.error(f"Config save error: {e}")
+
+    def toggle_auto_scan(self):
+        if self.auto_scan_var.get() and self.selected_root:
+            self.start_auto_scan()
+        else:
+            self.stop_auto_scan()
+
+    def start_auto_scan(self):
+        self.stop_auto_scan()
+        if not self.selected_root: return
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+        class Handler(FileSystemEventHandler):
+            def __init__(self, app):
+                self.app = app
+                self.batcher = EventBatcher(app, app.apply_file_events)
+            def relevant(self, event, *paths):
+                return event.is_directory or any(
+                    Path(p).suffix.lower() in self.app.allowed_extensions for p in paths
+                )
+            def on_created(self, event):
+                if self.relevant(event, event.src_path):
+                    self.batcher.push(("created", event.src_path, None, event.is_directory))
+            def on_deleted(self, event):
+                if self.relevant(event, event.src_path):
+                    self.batcher.push(("deleted", event.src_path, None, event.is_directory))
+            def on_moved(self, event):
+                if self.relevant(event, event.src_path, event.dest_path):
+                    self.batcher.push(("moved", event.src_path, event.dest_path, event.is_directory))
+        observer = Observer()
+        observer.schedule(Handler(self), str(self.selected_root), recursive=True)
+        self.auto_observer = observer
+        # Setting up recursive watches walks the tree, so keep it off the Tk thread
+        threading.Thread(target=self._start_observer, args=(observer,), daemon=True).start()
+
+    def _start_observer(self, observer):
+        try:
+            observer.start()
+        except Exception as e:
+            logging.error(f"Auto-scan failed to start: {e}")
+            return
+        if self.auto_observer is not observer:
+            # Superseded while starting
+            observer.stop()
+            observer.join()
+
+    def stop_auto_scan(self):
+        observer, self.auto_observer = self.auto_observer, None
+        if observer and observer.is_alive():
+            observer.stop()
+            observer.join()
+
+    def destroy(self):
+        self.scan_worker.cancel()
+        self.stop_auto_scan()
+        self.save_config()
+        self.history.close()
+        self.perf.close()
+        self.rename_plan.close()
+        super().destroy()
+
+
+def main():
+    setup_environment()
+    app = FileRenamerApp()
+    app.mainloop()
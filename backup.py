@@ -0,0 +1,170 @@
+# backup.py - Content-addressed backups of the app's settings files
+import os
+import re
+import json
+import shutil
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+
+KEEP_SNAPSHOTS = 30
+KEEP_DAYS = 90
+TIME_FORMAT = "%Y%m%d_%H%M%S"
+# Folders written by the old "one folder per launch" backup
+LEGACY_FOLDER_RE = re.compile(r"^\d{8}_\d{6}$")
+
+
+def file_hash(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BackupStore:
+    """
+    Snapshots of a few small files, stored once per distinct content.
+    backup/objects/<sha256> holds each file version; backup/snapshots.json
+    lists snapshots as {"time", "files": {name: sha256}}. A snapshot is only
+    recorded when some file's hash differs from the latest one, and
+    retention keeps the newest `keep` snapshots that are younger than
+    `keep_days` (the latest snapshot is always kept).
+    """
+
+    def __init__(self, root, keep=KEEP_SNAPSHOTS, keep_days=KEEP_DAYS):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.manifest_path = self.root / "snapshots.json"
+        self.keep = max(1, int(keep))
+        self.keep_days = keep_days
+
+    # ============ Public API ============
+
+    def snapshot(self, items, now=None) -> bool:
+        """Back up [(src_path, name)]; returns False if nothing changed"""
+        now = now or datetime.now()
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        snapshots = self._load()
+        self._import_legacy(snapshots)
+
+        files = self._store_files(items)
+        latest = snapshots[-1]["files"] if snapshots else None
+        changed = files and files != latest
+        if changed:
+            snapshots.append({"time": now.strftime(TIME_FORMAT), "files": files})
+        before = list(snapshots)
+        removed = self._apply_retention(snapshots, now)
+        if changed or removed:
+            self._save(snapshots)
+        if removed:
+            self._collect_garbage(before, snapshots)
+        return bool(changed)
+
+    def restore(self, snapshot, dest_dir) -> list:
+        """Copy a snapshot's files into dest_dir; returns the written paths"""
+        written = []
+        for name, digest in snapshot["files"].items():
+            target = Path(dest_dir) / name
+            shutil.copyfile(self.objects_dir / digest, target)
+            written.append(target)
+        return written
+
+    def snapshots(self) -> list:
+        return self._load()
+
+    # ============ Internals ============
+
+    def _store_files(self, items) -> dict:
+        files = {}
+        for src, name in items:
+            try:
+                if Path(src).is_file():
+                    files[name] = self._store(src)
+            except Exception as e:
+                logging.warning(f"Backup failed for {name}: {e}")
+        return files
+
+    def _store(self, src) -> str:
+        digest = file_hash(src)
+        target = self.objects_dir / digest
+        if not target.exists():
+            tmp = target.with_suffix(".tmp")
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, target)
+        return digest
+
+    def _import_legacy(self, snapshots):
+        """Fold old timestamp folders into the store, then delete them"""
+        try:
+            legacy = sorted(
+                entry for entry in os.listdir(self.root)
+                if LEGACY_FOLDER_RE.match(entry) and (self.root / entry).is_dir()
+            )
+        except OSError:
+            return
+        if not legacy:
+            return
+        latest = snapshots[-1]["files"] if snapshots else None
+        for stamp in legacy:
+            folder = self.root / stamp
+            try:
+                files = {entry.name: self._store(entry.path) for entry in os.scandir(folder) if entry.is_file()}
+            except Exception as e:
+                logging.warning(f"Skipping legacy backup {stamp}: {e}")
+                continue
+            if files and files != latest:
+                snapshots.append({"time": stamp, "files": files})
+                latest = files
+            shutil.rmtree(folder, ignore_errors=True)
+        snapshots.sort(key=lambda s: s["time"])
+        self._save(snapshots)
+        logging.info(f"Imported {len(legacy)} legacy backup folders")
+
+    def _apply_retention(self, snapshots, now) -> int:
+        before = len(snapshots)
+        cutoff = (now - timedelta(days=self.keep_days)).strftime(TIME_FORMAT) if self.keep_days else ""
+        kept = [s for s in snapshots[-self.keep:] if s["time"] >= cutoff]
+        if not kept and snapshots:
+            kept = snapshots[-1:]
+        snapshots[:] = kept
+        return before - len(kept)
+
+    def _collect_garbage(self, before, after):
+        """
+        Delete the objects only the snapshots dropped by retention used.
+        Objects no snapshot mentions are left alone: after a lost manifest
+        they are the only copy of the old backups.
+        """
+        live = {digest for s in after for digest in s["files"].values()}
+        dropped = {digest for s in before for digest in s["files"].values()} - live
+        for digest in dropped:
+            try:
+                os.remove(self.objects_dir / digest)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.warning(f"Could not remove backup object {digest}: {e}")
+
+    def _load(self) -> list:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            # Kept aside for manual recovery; the next snapshot would overwrite it
+            aside = self.manifest_path.with_name(f"{self.manifest_path.name}.corrupt-{datetime.now().strftime(TIME_FORMAT)}")
+            try:
+                os.replace(self.manifest_path, aside)
+            except OSError:
+                aside = self.manifest_path
+            logging.warning(f"Backup manifest unreadable, starting fresh (old manifest: {aside.name}): {e}")
+            return []
+
+    def _save(self, snapshots):
+        tmp = self.manifest_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshots, f, indent=1)
+        os.replace(tmp, self.manifest_path)
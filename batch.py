@@ -0,0 +1,127 @@
+# batch.py - Parallel batch renames, serialized per party folder
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from core import DONE_FOLDER_NAME, folder_names, move_to_done, plan_new_name, rename_in_place, restore_file
+
+DEFAULT_WORKERS = 8
+# Progress callbacks fire at most this often (and once at the end)
+PROGRESS_INTERVAL = 0.1
+
+
+def plan_batch(files, party_map, naming, machine):
+    """Split files into (file_path, new_name) tasks and files skipped for lack of a party code"""
+    tasks, skipped = [], []
+    for file_path in files:
+        new_name = plan_new_name(file_path, party_map, naming, machine)
+        if new_name:
+            tasks.append((file_path, new_name))
+        else:
+            skipped.append(file_path)
+    return tasks, skipped
+
+
+def done_folder_names(folder):
+    return folder_names(folder / DONE_FOLDER_NAME)
+
+
+def plan_undo(items):
+    """(original path, current path) tasks that reverse history items"""
+    return [(Path(item["old"]), Path(item["new"])) for item in items]
+
+
+class BatchExecutor:
+    """
+    Runs planned renames on a bounded thread pool.
+    Files of one folder run in order on a single worker, so the collision
+    checks inside a party folder (and its Done folder) never race; separate
+    folders proceed in parallel, which hides SMB round-trip latency.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, operation=move_to_done, folder_state=done_folder_names):
+        self.workers = max(1, int(workers))
+        self.operation = operation
+        self.folder_state = folder_state
+
+    @classmethod
+    def for_undo(cls, workers=DEFAULT_WORKERS):
+        """Executor that runs plan_undo() tasks, one worker per destination folder"""
+        return cls(workers, operation=restore_file, folder_state=folder_names)
+
+    @classmethod
+    def for_finalize(cls, workers=DEFAULT_WORKERS):
+        """Executor for finalize tasks: renames inside the Done folder, no overwrite"""
+        return cls(workers, operation=rename_in_place, folder_state=folder_names)
+
+    def run(self, tasks, on_progress=None, on_result=None, on_intent=None, stats=None):
+        """
+        Run tasks; returns one {"old", "new", "error"} dict per task, in plan order.
+        on_result(i, result) is called from the worker thread as each file finishes.
+        on_intent(i, final_path), if given, is called through the operation's
+        before_rename hook, so the resolved name is known before the file moves.
+        If given, `stats` is filled with "listdir_calls" and "rename_calls"
+        (every rename attempt, retries included).
+        """
+        results = [None] * len(tasks)
+        by_folder = defaultdict(list)
+        for i, (file_path, _) in enumerate(tasks):
+            by_folder[file_path.parent].append(i)
+
+        lock = threading.Lock()
+        progress = {"done": 0, "last": 0.0}
+        if stats is not None:
+            stats.update(listdir_calls=0, rename_calls=0)
+
+        def before_rename(i, final_path):
+            if stats is not None:
+                with lock:
+                    stats["rename_calls"] += 1
+            if on_intent:
+                on_intent(i, final_path)
+
+        def report():
+            with lock:
+                progress["done"] += 1
+                now = time.monotonic()
+                if progress["done"] < len(tasks) and now - progress["last"] < PROGRESS_INTERVAL:
+                    return
+                progress["last"] = now
+                done = progress["done"]
+            if on_progress:
+                on_progress(done, len(tasks))
+
+        def run_folder(indexes):
+            # One listing per folder, kept current as files land in it
+            try:
+                if stats is not None:
+                    with lock:
+                        stats["listdir_calls"] += 1
+                taken = self.folder_state(tasks[indexes[0]][0].parent)
+                listing_error = None
+            except Exception as e:
+                # Unreadable folder (or a file named Done): fail its files, keep the others going
+                taken = None
+                listing_error = f"Folder listing failed: {e}"
+            for i in indexes:
+                file_path, new_name = tasks[i]
+                if listing_error:
+                    results[i] = {"old": file_path, "new": None, "error": listing_error}
+                else:
+                    hook = {"before_rename": partial(before_rename, i)} if on_intent or stats is not None else {}
+                    try:
+                        new = self.operation(file_path, new_name, taken, **hook)
+                        results[i] = {"old": file_path, "new": new, "error": None}
+                    except Exception as e:
+                        results[i] = {"old": file_path, "new": None, "error": str(e)}
+                if on_result:
+                    on_result(i, results[i])
+                report()
+
+        if by_folder:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(by_folder))) as pool:
+                list(pool.map(run_folder, by_folder.values()))
+        return results
@@ -0,0 +1,88 @@
+# bench_naming.py - Names per second: original per-call regexes vs NamingEngine
+#
+# Usage: python benchmarks/bench_naming.py [--names 100000]
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from naming import NamingEngine, to_feet  # noqa: E402
+
+KEYWORDS = ["copy", "copies", "pcs", "pieces", "x", "ng"]
+WORDS = ["flex", "banner", "vinyl", "standee", "board", "sticker", "Sunrise", "offset", "layout"]
+
+
+def synthetic_names(count, seed=7):
+    """Print-shop style stems such as 'banner 36x48 2 pcs final'"""
+    rng = random.Random(seed)
+    names = []
+    for i in range(count):
+        parts = [rng.choice(WORDS), str(i)]
+        if rng.random() < 0.8:
+            parts.append(f"{rng.randint(10, 120)}{rng.choice(['x', ' x ', 'X'])}{rng.randint(10, 120)}")
+        if rng.random() < 0.6:
+            qty, kw = rng.randint(1, 20), rng.choice(KEYWORDS)
+            parts.append(f"{qty} {kw}" if rng.random() < 0.5 else f"{kw} {qty}")
+        parts.append(rng.choice(WORDS))
+        names.append(" ".join(parts))
+    return names
+
+
+def legacy_extract_dimensions(filename):
+    clean = re.sub(r'\s+', ' ', filename.replace('X', 'x').lower())
+    match = re.search(r'(\d+\.?\d*)\s*x\s*(\d+\.?\d*)', clean)
+    if not match:
+        return ""
+    w_ft, h_ft = to_feet(float(match.group(1))), to_feet(float(match.group(2)))
+    if w_ft * h_ft < 2:
+        w_ft, h_ft = 1, 2
+    return f"{w_ft}x{h_ft}"
+
+
+def legacy_detect_quantity(filename, keywords):
+    clean = re.sub(r'\s+', ' ', filename.strip().lower())
+    clean = re.sub(r'\d+\s*x\s*\d+', '', clean)
+    clean = re.sub(r'\s+', ' ', clean).strip()
+    for kw in keywords:
+        match = re.search(rf'\b(\d+)\s*{re.escape(kw)}\b', clean)
+        if match:
+            return int(match.group(1))
+        match = re.search(rf'\b{re.escape(kw)}\s*(\d+)\b', clean)
+        if match:
+            return int(match.group(1))
+    return 1
+
+
+def legacy_name(stem):
+    dim = legacy_extract_dimensions(stem + ".plt")
+    qty = legacy_detect_quantity(stem, KEYWORDS)
+    dim_part = f"(FT.{dim})" if dim else ""
+    return f"5_{stem} (C.S){dim_part}(Q.{qty})%%.plt"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--names", type=int, default=100_000)
+    args = parser.parse_args()
+    names = synthetic_names(args.names)
+    engine = NamingEngine(KEYWORDS)
+
+    def engine_name(stem):
+        dim = engine.extract_dimensions(stem + ".plt")
+        return engine.generate_new_filename(stem, "5", ".plt", dim, "(C.S)")
+
+    results = {}
+    for label, func in (("legacy", legacy_name), ("engine cold", engine_name), ("engine cached", engine_name)):
+        start = time.perf_counter()
+        results[label] = [func(n) for n in names]
+        elapsed = time.perf_counter() - start
+        print(f"{label:14} {len(names) / elapsed:12,.0f} names/s ({elapsed:.3f}s)")
+    print(f"Same names: {results['legacy'] == results['engine cold'] == results['engine cached']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# bench_rename.py - Filesystem calls per renamed file: rename+move vs single rename
+#
+# Runs on tmpfs (/dev/shm when available) and again with every filesystem
+# call delayed by --latency-ms to stand in for an SMB share.
+# Usage: python benchmarks/bench_rename.py [--files 2000] [--latency-ms 2]
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import core  # noqa: E402
+from core import folder_names, move_to_done  # noqa: E402
+
+WRAPPED = ["stat", "lstat", "rename", "replace", "link", "symlink", "mkdir", "listdir", "scandir", "unlink", "open"]
+
+
+@contextmanager
+def slow_fs(latency):
+    """Count (and optionally delay) every os-level filesystem call"""
+    counts = Counter()
+    originals = {name: getattr(os, name) for name in WRAPPED}
+    # The no-replace rename syscall goes through ctypes, not os
+    renameat2 = core._renameat2
+
+    def wrap(name, func):
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            if latency:
+                time.sleep(latency)
+            return func(*args, **kwargs)
+        return wrapper
+
+    for name, func in originals.items():
+        setattr(os, name, wrap(name, func))
+    core._renameat2 = wrap("renameat2", renameat2)
+    try:
+        yield counts
+    finally:
+        for name, func in originals.items():
+            setattr(os, name, func)
+        core._renameat2 = renameat2
+
+
+def legacy_move_to_done(file_path, new_name):
+    """The original pipeline: probe, rename in place, mkdir Done, shutil.move"""
+    new_path = file_path.parent / new_name
+    counter = 1
+    original = new_path
+    while new_path.exists():
+        new_path = original.parent / f"{original.stem} ({counter}){original.suffix}"
+        counter += 1
+    file_path.rename(new_path)
+    done_folder = file_path.parent / "Done"
+    done_folder.mkdir(exist_ok=True)
+    final_path = done_folder / new_path.name
+    shutil.move(str(new_path), str(final_path))
+    return final_path
+
+
+def make_files(base, count):
+    files = []
+    for i in range(count):
+        party = base / f"party {i % 20}"
+        party.mkdir(exist_ok=True)
+        (party / "Done").mkdir(exist_ok=True)
+        path = party / f"job {i} 36x48 2 pcs.plt"
+        path.touch()
+        files.append(path)
+    return files
+
+
+def run(label, base, count, latency, func, shared_listing):
+    files = make_files(base, count)
+    listings = {}
+    with slow_fs(latency) as counts:
+        start = time.perf_counter()
+        for path in files:
+            new_name = f"5_{path.stem} (C.S)(FT.3x4)(Q.2)%%.plt"
+            if shared_listing:
+                if path.parent not in listings:
+                    listings[path.parent] = folder_names(path.parent / "Done")
+                func(path, new_name, listings[path.parent])
+            else:
+                func(path, new_name)
+        elapsed = time.perf_counter() - start
+    calls = sum(counts.values())
+    detail = ", ".join(f"{k}={v / count:.2f}" for k, v in sorted(counts.items()))
+    print(f"{label:28} {elapsed:7.3f}s | {calls / count:5.2f} fs calls/file ({detail})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    tmp_root = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    for latency in (0.0, args.latency_ms / 1000):
+        files = args.files if not latency else max(1, args.files // 10)
+        print(f"--- {'tmpfs' if not latency else f'{args.latency_ms} ms per call'}, {files} files ---")
+        for label, func, shared in (
+            ("rename + shutil.move", legacy_move_to_done, False),
+            ("single rename", move_to_done, False),
+            ("single rename, batch listing", move_to_done, True),
+        ):
+            with tempfile.TemporaryDirectory(dir=tmp_root) as tmp:
+                run(label, Path(tmp), files, latency, func, shared)
+
+
+if __name__ == "__main__":
+    main()
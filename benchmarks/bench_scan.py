@@ -0,0 +1,72 @@
+# bench_scan.py - Compare the legacy rglob fan-out with the single-pass scanner
+#
+# Usage: python benchmarks/bench_scan.py [--files 100000] [--root DIR]
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scanner import scan_files  # noqa: E402
+from file_index import FileIndex  # noqa: E402
+from synthetic_tree import build_tree  # noqa: E402
+
+EXTENSIONS = {'.plt', '.jpg', '.jpeg', '.jpe', '.jfif'}
+
+
+def legacy_scan(root: Path, finalize: bool):
+    """The original scan_folder logic: two rglob walks per extension"""
+    files = []
+    for ext in EXTENSIONS:
+        if finalize:
+            files.extend(root.rglob(f"Done/*{ext}"))
+            files.extend(root.rglob(f"Done/*{ext.upper()}"))
+        else:
+            files.extend(root.rglob(f"*{ext}"))
+            files.extend(root.rglob(f"*{ext.upper()}"))
+    result = []
+    for file_path in sorted(set(files), key=lambda x: x.name.lower()):
+        in_done = "done" in [p.lower() for p in file_path.relative_to(root).parts]
+        if in_done != finalize: continue
+        if "[ok]" in file_path.name and finalize: continue
+        result.append(file_path)
+    return result
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--root", help="Scan an existing tree instead of a synthetic one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(args.root) if args.root else Path(tmp)
+        if not args.root:
+            print(f"Building synthetic tree with {args.files} files...")
+            root = build_tree(root, args.files)
+        for finalize in (False, True):
+            mode = "Finalize Mode" if finalize else "New Files"
+            old, old_t = timed(legacy_scan, root, finalize)
+            new, new_t = timed(scan_files, root, EXTENSIONS, finalize)
+            index = FileIndex(Path(tmp).parent / f"{Path(tmp).name}.db")
+            cold, cold_t = timed(index.scan, root, EXTENSIONS, finalize)
+            warm, warm_t = timed(index.scan, root, EXTENSIONS, finalize)
+            same = set(old) == set(new) == set(cold) == set(warm)
+            os.remove(index.db_path)
+            print(f"{mode:14} rglob: {old_t:7.3f}s ({len(old)} files) | "
+                  f"scandir: {new_t:7.3f}s ({len(new)} files) | "
+                  f"speedup x{old_t / max(new_t, 1e-9):.1f} | "
+                  f"index cold/warm: {cold_t:.3f}s/{warm_t:.3f}s | same result: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# bench_startup.py - Time-to-first-paint and time-to-interactive of the GUI
+#
+# Each run starts a fresh interpreter, builds FileRenamerApp and waits for
+# the "interactive" mark (first background scan finished). Needs a display.
+# Usage: python benchmarks/bench_startup.py [--runs 5] [--root E:/2025] [--json out.json]
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+TIMEOUT_MS = 60_000
+
+
+def child(root):
+    start = time.perf_counter()
+    sys.path.insert(0, str(PROJECT_DIR))
+    import app as gui
+    import_ms = (time.perf_counter() - start) * 1000
+
+    gui.setup_environment()
+    app = gui.FileRenamerApp()
+    saved_folder = app.last_folder
+    if root is not None:
+        app.last_folder = root
+
+    def poll():
+        if "interactive" in app.startup_marks:
+            app.last_folder = saved_folder  # don't let the benchmark change config.json
+            app.destroy()
+        else:
+            app.after(10, poll)
+
+    app.after(10, poll)
+    app.after(TIMEOUT_MS, app.destroy)
+    app.mainloop()
+    print(json.dumps({"import": round(import_ms, 1), **app.startup_marks}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--root", help="Folder to scan instead of last_folder from config.json")
+    parser.add_argument("--json", help="Write the raw and median timings here")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.root)
+        return
+
+    runs = []
+    for _ in range(args.runs):
+        cmd = [sys.executable, __file__, "--child"] + (["--root", args.root] if args.root else [])
+        out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+    stages = ["import", "init", "first_paint", "interactive"]
+    medians = {s: statistics.median(r[s] for r in runs if s in r) for s in stages if any(s in r for r in runs)}
+    for stage, ms in medians.items():
+        print(f"{stage:12} {ms:8.1f} ms (median of {len(runs)})")
+    if args.json:
+        Path(args.json).write_text(json.dumps({"runs": runs, "median": medians}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# check_import_time.py - Import-time budget check based on `python -X importtime`
+#
+# Fails (exit code 1) if importing main.py, app.py or headless.py takes longer
+# than its budget, pulls in a module that must stay lazy, or touches the disk.
+# Usage: python benchmarks/check_import_time.py [--runs 3] [--app-budget-ms 400]
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+# module → (budget option, modules that must not be imported with it)
+TARGETS = {
+    # Re-run as __mp_main__ by every plot size worker: no GUI at all
+    "main": ("main_budget_ms", ["tkinter", "customtkinter", "requests", "watchdog", "multiprocessing"]),
+    "app": ("app_budget_ms", ["requests", "watchdog", "webbrowser", "multiprocessing"]),
+    "headless": ("headless_budget_ms", ["tkinter", "customtkinter", "requests", "watchdog", "multiprocessing"]),
+}
+DEFAULT_BUDGETS_MS = {"main": 20.0, "app": 400.0, "headless": 50.0}
+
+
+def snapshot():
+    """Project files a side-effect-free import must leave alone"""
+    entries = set()
+    for folder in (PROJECT_DIR, PROJECT_DIR / "logs"):
+        if folder.is_dir():
+            entries.update(str(folder / name) for name in os.listdir(folder) if name != "__pycache__")
+    return entries
+
+
+def measure(module):
+    """Cumulative import time (ms) of `module` and every module it loaded"""
+    code = f"import {module}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    )
+    total_us = None
+    loaded = set()
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if not match:
+            continue
+        loaded.add(match.group(4))
+        if match.group(4) == module and len(match.group(3)) <= 1:
+            total_us = int(match.group(2))
+    return total_us / 1000, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3, help="Best of N runs is compared to the budget")
+    for module, (budget_opt, _) in TARGETS.items():
+        parser.add_argument(f"--{budget_opt.replace('_', '-')}", type=float, default=DEFAULT_BUDGETS_MS[module])
+    args = parser.parse_args()
+
+    failures = []
+    before = snapshot()
+    for module, (budget_opt, forbidden) in TARGETS.items():
+        budget = getattr(args, budget_opt)
+        results = [measure(module) for _ in range(args.runs)]
+        best = min(ms for ms, _ in results)
+        leaked = sorted({m for _, loaded in results for m in loaded if m.split(".")[0] in forbidden})
+        status = "OK" if best <= budget else "OVER BUDGET"
+        print(f"{module:10} {best:8.1f} ms (budget {budget:.0f} ms) {status}")
+        if best > budget:
+            failures.append(f"{module} import took {best:.1f} ms > {budget:.0f} ms")
+        if leaked:
+            failures.append(f"{module} eagerly imports {', '.join(leaked)}")
+    created = snapshot() - before
+    if created:
+        failures.append(f"import created files: {', '.join(sorted(created))}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
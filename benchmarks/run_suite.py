@@ -0,0 +1,178 @@
+# run_suite.py - Headless benchmark suite: scan, search, naming, batch rename, undo
+#
+# Builds a synthetic print-shop tree per size (see synthetic_tree.py), times
+# every stage with the same modules the app uses and writes the results as
+# JSON. --compare prints the change of every timing against an older run.
+# Usage: python benchmarks/run_suite.py [--sizes 1000,10000,100000] [--json out.json] [--compare old.json]
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from batch import BatchExecutor, plan_batch, plan_undo  # noqa: E402
+from core import ALLOWED_EXTENSIONS, DEFAULT_KEYWORDS, DEFAULT_MACHINE, plan_new_name  # noqa: E402
+from file_index import FileIndex  # noqa: E402
+from naming import NamingEngine  # noqa: E402
+from parties import PartyMap  # noqa: E402
+from scanner import scan_files  # noqa: E402
+from search_index import SearchIndex  # noqa: E402
+from synthetic_tree import build_tree, party_map  # noqa: E402
+
+# Typed queries are replayed keystroke by keystroke, like the debounced search box
+QUERIES = ["pcs", "36x48", "sunrise", "party 01", "banner"]
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, round(time.perf_counter() - start, 4)
+
+
+def bench_scan(year, tmp):
+    files, scandir_s = timed(scan_files, year, ALLOWED_EXTENSIONS)
+    index = FileIndex(Path(tmp) / "file_index.db")
+    stats = {}
+    _, cold_s = timed(lambda: list(index.iter_scan(year, ALLOWED_EXTENSIONS, stats=stats)))
+    cold_calls = dict(stats)
+    _, warm_s = timed(lambda: list(index.iter_scan(year, ALLOWED_EXTENSIONS, stats=stats)))
+    result = {
+        "files": len(files), "scandir_s": scandir_s, "index_cold_s": cold_s, "index_warm_s": warm_s,
+        "index_cold_listdir_calls": cold_calls["listdir_calls"], "index_warm_listdir_calls": stats["listdir_calls"],
+    }
+    return files, result
+
+
+def bench_search(files, parties):
+    def text_for(path):
+        return f"{path.name}\n{path.parent.name}\n{parties.get(path.parent.name, '')}".lower()
+
+    index = SearchIndex(text_for)
+    _, build_s = timed(index.rebuild, files)
+    queries = {}
+    for query in QUERIES:
+        start = time.perf_counter()
+        for end in range(1, len(query) + 1):
+            matches = index.search(query[:end], files)
+        queries[query] = {"ms": round((time.perf_counter() - start) * 1000, 2), "matches": len(matches)}
+    return {"build_s": build_s, "queries": queries}
+
+
+def bench_naming(files, parties):
+    naming = NamingEngine(DEFAULT_KEYWORDS)
+
+    def plan_all():
+        return [plan_new_name(p, parties, naming, DEFAULT_MACHINE) for p in files]
+
+    names, cold_s = timed(plan_all)
+    _, cached_s = timed(plan_all)
+    return {
+        "names": sum(1 for n in names if n), "cold_s": cold_s, "cached_s": cached_s,
+        "names_per_sec": round(len(files) / max(cold_s, 1e-9)),
+    }
+
+
+def bench_batch(files, parties, workers):
+    naming = NamingEngine(DEFAULT_KEYWORDS)
+    (tasks, skipped), plan_s = timed(plan_batch, files, parties, naming, DEFAULT_MACHINE)
+    results, run_s = timed(BatchExecutor(workers).run, tasks)
+    renamed = [r for r in results if not r["error"]]
+    rename = {
+        "files": len(tasks), "renamed": len(renamed), "failed": len(results) - len(renamed),
+        "skipped": len(skipped), "plan_s": plan_s, "run_s": run_s,
+    }
+    undo_tasks = plan_undo({"old": str(r["old"]), "new": str(r["new"])} for r in renamed)
+    undo_results, undo_s = timed(BatchExecutor.for_undo(workers).run, undo_tasks)
+    failed = sum(1 for r in undo_results if r["error"])
+    undo = {"files": len(undo_tasks), "restored": len(undo_tasks) - failed, "failed": failed, "run_s": undo_s}
+    return rename, undo
+
+
+def run_size(size, workers, tmp_root):
+    with tempfile.TemporaryDirectory(dir=tmp_root) as tmp:
+        year, build_s = timed(build_tree, tmp, size)
+        parties = PartyMap(party_map())
+        files, scan = bench_scan(year, tmp)
+        result = {"tree_build_s": build_s, "scan": scan}
+        result["search"] = bench_search(files, parties)
+        result["naming"] = bench_naming(files, parties)
+        result["batch_rename"], result["undo"] = bench_batch(files, parties, workers)
+        return result
+
+
+def flatten(data, prefix=""):
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def compare(old, new):
+    """Print the change of every timing (keys ending in _s / .ms) against an older run"""
+    before = flatten(old["results"])
+    after = flatten(new["results"])
+    print(f"\n--- vs {old.get('version', '?')} ({old.get('timestamp', '?')}) ---")
+    for key, value in after.items():
+        if not (key.endswith("_s") or key.endswith(".ms")) or key.endswith("tree_build_s"):
+            continue
+        base = before.get(key)
+        if not base:
+            continue
+        change = (value - base) / base * 100
+        flag = "  ⚠️ slower" if change > 20 else ""
+        print(f"{key:45} {base:10.4f} → {value:10.4f} ({change:+6.1f}%){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated file counts")
+    parser.add_argument("--workers", type=int, default=8, help="Batch executor threads")
+    parser.add_argument("--tmp", help="Where to build the trees (default: system temp)")
+    parser.add_argument("--json", help="Results file (default: benchmarks/results/suite-<version>-<time>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    version = (PROJECT_DIR / "version.txt").read_text().strip()
+    stamp = datetime.now()
+    report = {
+        "version": version,
+        "timestamp": stamp.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "workers": args.workers,
+        "results": {},
+    }
+    for size in (int(s) for s in args.sizes.split(",")):
+        print(f"Running suite with {size} files...")
+        result = run_size(size, args.workers, args.tmp)
+        report["results"][str(size)] = result
+        scan, naming = result["scan"], result["naming"]
+        rename, undo = result["batch_rename"], result["undo"]
+        search_ms = sum(q["ms"] for q in result["search"]["queries"].values())
+        print(f"  scan {scan['scandir_s']:.3f}s (index cold/warm {scan['index_cold_s']:.3f}s/{scan['index_warm_s']:.3f}s)"
+              f" | search {result['search']['build_s']:.3f}s build, {search_ms:.1f} ms typing"
+              f" | naming {naming['names_per_sec']:,}/s"
+              f" | rename {rename['renamed']} in {rename['run_s']:.3f}s | undo {undo['restored']} in {undo['run_s']:.3f}s")
+
+    out = Path(args.json) if args.json else (
+        PROJECT_DIR / "benchmarks" / "results" / f"suite-{version}-{stamp.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {out}")
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text()), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# synthetic_tree.py - Realistic print-shop folder trees for the benchmark suite
+#
+# year → month → date → party → files, with a Done/ folder per party holding
+# already-renamed jobs, mixed-case extensions, a few non-print files, and
+# dimension/quantity tokens in the names (from bench_naming.synthetic_names).
+import os
+import random
+import time
+from pathlib import Path
+
+from bench_naming import synthetic_names
+
+MONTHS = ["01 jan", "02 feb", "03 mar", "04 apr", "05 may", "06 jun",
+          "07 jul", "08 aug", "09 sep", "10 oct", "11 nov", "12 dec"]
+PARTIES = [f"Party {i:03}" for i in range(150)] + ["Creative", "Pranam Maheta", "XYZ Designs", "Sunrise", "Vikas"]
+# Weighted like a real job mix: mostly PLT, some photos, a little noise
+EXTENSIONS = [".plt"] * 6 + [".PLT"] * 2 + [".jpg", ".JPG", ".jpeg", ".jfif", ".txt", ".pdf"]
+PARTIES_PER_DAY = 12
+FILES_PER_PARTY = 10
+DONE_SHARE = 0.3
+
+
+def party_map(missing_every=25) -> dict:
+    """Party name → code, leaving every Nth party without a code"""
+    return {name: str(i % 90 + 10) for i, name in enumerate(PARTIES) if i % missing_every}
+
+
+def build_tree(root, total, seed=7) -> Path:
+    """Create about `total` files under root/2025 and return the year folder"""
+    rng = random.Random(seed)
+    year = Path(root) / "2025"
+    stems = synthetic_names(total, seed)
+    created = 0
+    day = 0
+    while created < total:
+        month = MONTHS[day // 28 % len(MONTHS)]
+        date_dir = year / month / f"{day % 28 + 1}-{day // 28 % len(MONTHS) + 1}"
+        for party in rng.sample(PARTIES, PARTIES_PER_DAY):
+            party_dir = date_dir / party
+            done_dir = party_dir / "Done"
+            done_dir.mkdir(parents=True, exist_ok=True)
+            for _ in range(FILES_PER_PARTY):
+                if created >= total:
+                    break
+                stem = stems[created]
+                ext = rng.choice(EXTENSIONS)
+                if rng.random() < DONE_SHARE:
+                    target = done_dir / f"{rng.randint(10, 99)}_{stem} (C.S)(Q.1)%%{ext}"
+                else:
+                    target = party_dir / f"{stem}{ext}"
+                target.touch()
+                created += 1
+            if created >= total:
+                break
+        day += 1
+    # Real trees are old; age folder mtimes so the file index can trust them
+    stamp = time.time() - 3600
+    for folder, _, _ in os.walk(year):
+        os.utime(folder, (stamp, stamp))
+    return year
@@ -0,0 +1,49 @@
+# categories.py - Finalize categories: validation and prefix completion
+import bisect
+
+
+def category_key(text: str) -> str:
+    """Lookup key: '%6%', ' 6 ' and '6' are the same code; descriptions ignore case"""
+    return text.strip().strip("%").strip().casefold()
+
+
+class CategoryIndex:
+    """
+    codes/categories.csv as lookups. A category can be typed as its code
+    or its description; both map to the code that goes into the file
+    name. Keys are kept sorted, so completion is a bisect plus a short
+    scan instead of a pass over the whole table.
+    """
+
+    def __init__(self, entries=None):
+        self.descriptions = dict(entries or {})
+        self.by_key = {}
+        for code in self.descriptions:
+            self.by_key.setdefault(category_key(code), code)
+        for code, description in self.descriptions.items():
+            if description:
+                self.by_key.setdefault(category_key(description), code)
+        self.keys = sorted(self.by_key)
+
+    def __len__(self):
+        return len(self.descriptions)
+
+    def resolve(self, text):
+        """Code for a typed code or description, None if it is not a category"""
+        return self.by_key.get(category_key(text))
+
+    def complete(self, prefix, limit=8) -> list:
+        """[(code, "code · description")] whose code or description starts with prefix"""
+        key = category_key(prefix)
+        keys = self.keys
+        i = bisect.bisect_left(keys, key)
+        seen = set()
+        matches = []
+        while i < len(keys) and keys[i].startswith(key) and len(matches) < limit:
+            code = self.by_key[keys[i]]
+            if code not in seen:
+                seen.add(code)
+                description = self.descriptions[code]
+                matches.append((code, f"{code} · {description}" if description else code))
+            i += 1
+        return matches
@@ -0,0 +1,261 @@
+# core.py - GUI-free renaming core shared by the app and headless mode
+import csv
+import errno
+import hashlib
+import json
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+from naming import feet_size
+
+ALLOWED_EXTENSIONS = frozenset({'.plt', '.jpg', '.jpeg', '.jpe', '.jfif'})
+DEFAULT_KEYWORDS = ["copy", "copies", "pcs", "pieces", "x"]
+DEFAULT_MACHINE = "(C.S)"
+DEFAULT_PARTIES = [
+    ("Creative", "2"),
+    ("Pranam Maheta", "7"),
+    ("XYZ Designs", "5"),
+    ("Sunrise", "3"),
+    ("Vikas", "9"),
+]
+DONE_FOLDER_NAME = "Done"
+# renameat2() arguments (linux/fcntl.h, linux/fs.h)
+AT_FDCWD = -100
+RENAME_NOREPLACE = 1
+
+
+def create_default_parties_csv(csv_path):
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Party Name", "Code"])
+        writer.writerows(DEFAULT_PARTIES)
+
+
+def read_party_map(csv_path) -> dict:
+    """Party folder name → party code from parties.csv"""
+    party_map = {}
+    with open(csv_path, mode='r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            name = (row.get("Party Name") or "").strip()
+            code = (row.get("Code") or "").strip()
+            if name and code:
+                party_map[name] = code
+    return party_map
+
+
+def read_categories(csv_path) -> dict:
+    """Category code (without the % signs) → description from categories.csv"""
+    categories = {}
+    with open(csv_path, mode='r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            code = (row.get("Code") or "").strip().strip("%").strip()
+            description = (row.get("Description") or "").strip()
+            if code:
+                categories[code] = description
+    return categories
+
+
+def read_quantity_keywords(keywords_file) -> list:
+    with open(keywords_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("quantity_keywords", DEFAULT_KEYWORDS)
+
+
+class NameSet(set):
+    """
+    Case-normalized names of one folder, listed once and kept current by
+    the renames that use it. Remembers where free_name() stopped for each
+    name, so a run of clashing files doesn't re-probe ' (1)', ' (2)', ...
+    """
+
+    def __init__(self, names=()):
+        super().__init__(names)
+        self.counters = {}
+
+
+def folder_names(folder) -> NameSet:
+    """Case-normalized names already in a folder (empty if it doesn't exist yet)"""
+    try:
+        return NameSet(os.path.normcase(name) for name in os.listdir(folder))
+    except FileNotFoundError:
+        return NameSet()
+
+
+def free_name(name: str, taken) -> str:
+    """
+    First name not in `taken` among 'name.ext', 'name (1).ext', 'name (2).ext', ...
+    Set lookups only, no filesystem calls. With a NameSet the search resumes
+    after the last suffix handed out for this name.
+    """
+    key = os.path.normcase(name)
+    if key not in taken:
+        return name
+    counters = getattr(taken, "counters", None)
+    stem, ext = os.path.splitext(name)
+    counter = counters.get(key, 1) if counters is not None else 1
+    candidate = f"{stem} ({counter}){ext}"
+    while os.path.normcase(candidate) in taken:
+        counter += 1
+        candidate = f"{stem} ({counter}){ext}"
+    if counters is not None:
+        counters[key] = counter + 1
+    return candidate
+
+
+def same_content(path_a, path_b) -> bool:
+    """True if both files exist with identical bytes (size first, then SHA-256)"""
+    try:
+        if os.path.getsize(path_a) != os.path.getsize(path_b):
+            return False
+        digests = []
+        for path in (path_a, path_b):
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 16), b""):
+                    digest.update(chunk)
+            digests.append(digest.digest())
+        return digests[0] == digests[1]
+    except OSError:
+        return False
+
+
+def plan_new_name(file_path: Path, party_map, naming, machine, plot_size=None):
+    """
+    New file name for a file in a party folder, or None if the party has no code.
+    plot_size (inches, read from the file) fills the size when the name has none.
+    """
+    code = party_map.get(file_path.parent.name)
+    if not code:
+        return None
+    dim = naming.extract_dimensions(file_path.name)
+    if not dim and plot_size:
+        dim = feet_size(*plot_size)
+    return naming.generate_new_filename(file_path.stem, code, file_path.suffix, dim, machine)
+
+
+@lru_cache(maxsize=None)
+def _libc_renameat2():
+    """libc's renameat2(), or None where the C library has no such symbol"""
+    if not sys.platform.startswith("linux"):
+        return None
+    # Imported here: only the first rename pays for it
+    import ctypes
+    try:
+        func = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):
+        return None
+    func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    func.restype = ctypes.c_int
+    return func
+
+
+def _renameat2(src, dst):
+    """renameat2(RENAME_NOREPLACE); OSError(ENOSYS) where it is not available"""
+    func = _libc_renameat2()
+    if func is None:
+        raise OSError(errno.ENOSYS, os.strerror(errno.ENOSYS), str(src))
+    import ctypes
+    if func(AT_FDCWD, os.fsencode(src), AT_FDCWD, os.fsencode(dst), RENAME_NOREPLACE) != 0:
+        code = ctypes.get_errno()
+        raise OSError(code, os.strerror(code), str(src), None, str(dst))
+
+
+def rename_no_replace(src, dst):
+    """
+    Rename that raises FileExistsError instead of replacing dst, as one
+    rename call. Windows' rename already refuses; on Linux renameat2()
+    with RENAME_NOREPLACE checks atomically. Elsewhere, or on filesystems
+    without that flag, dst is checked right before renaming.
+    """
+    if os.name != "nt":
+        try:
+            _renameat2(src, dst)
+            return
+        except OSError as e:
+            if e.errno not in (errno.ENOSYS, errno.EINVAL, errno.ENOTSUP, errno.EOPNOTSUPP):
+                raise
+        if os.path.lexists(dst):
+            raise FileExistsError(errno.EEXIST, "File exists", str(dst))
+    os.rename(src, dst)
+
+
+def move_to_done(file_path: Path, new_name: str, taken=None, before_rename=None) -> Path:
+    """
+    Move a file into its party's Done folder under new_name with one rename.
+    `taken` is the Done folder's name set; pass the same set for a run of
+    files in one folder so it is listed only once. A name that appeared in
+    Done since the listing is treated as taken, never overwritten.
+    before_rename(final_path) is called before each rename attempt.
+    """
+    done_folder = file_path.parent / DONE_FOLDER_NAME
+    if taken is None:
+        taken = folder_names(done_folder)
+    while True:
+        final_path = done_folder / free_name(new_name, taken)
+        if before_rename:
+            before_rename(final_path)
+        try:
+            rename_no_replace(file_path, final_path)
+            break
+        except FileExistsError:
+            taken.add(os.path.normcase(final_path.name))
+        except FileNotFoundError:
+            # Either the file is gone or this is the folder's first Done file
+            if done_folder.exists():
+                raise
+            done_folder.mkdir()
+    taken.add(os.path.normcase(final_path.name))
+    return final_path
+
+
+def restore_file(old_path: Path, current_path: Path, taken=None, before_rename=None) -> Path:
+    """
+    Undo a rename: move current_path back to old_path.
+    `taken` is the name set of old_path's folder; an existing file there is
+    never overwritten. before_rename(old_path) is called before each rename attempt.
+    """
+    if taken is None:
+        taken = folder_names(old_path.parent)
+    if os.path.normcase(old_path.name) in taken:
+        raise FileExistsError(f"{old_path.name} already exists in {old_path.parent.name}")
+    if before_rename:
+        before_rename(old_path)
+    try:
+        rename_no_replace(current_path, old_path)
+    except FileNotFoundError:
+        if old_path.parent.exists():
+            raise
+        old_path.parent.mkdir(parents=True)
+        if before_rename:
+            before_rename(old_path)
+        rename_no_replace(current_path, old_path)
+    taken.add(os.path.normcase(old_path.name))
+    taken.discard(os.path.normcase(current_path.name))
+    return old_path
+
+
+def rename_in_place(file_path: Path, new_name: str, taken=None, before_rename=None) -> Path:
+    """
+    Rename a file inside its own folder (finalize). `taken` is the folder's
+    name set; an existing file is never overwritten. before_rename(new_path)
+    is called right before the rename.
+    """
+    if taken is None:
+        taken = folder_names(file_path.parent)
+    key = os.path.normcase(new_name)
+    if key in taken and key != os.path.normcase(file_path.name):
+        raise FileExistsError(f"{new_name} already exists")
+    new_path = file_path.parent / new_name
+    if before_rename:
+        before_rename(new_path)
+    if key == os.path.normcase(file_path.name):
+        os.rename(file_path, new_path)  # case-only change of the same file
+    else:
+        rename_no_replace(file_path, new_path)
+    taken.discard(os.path.normcase(file_path.name))
+    taken.add(key)
+    return new_path
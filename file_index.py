@@ -0,0 +1,133 @@
+# file_index.py - Persistent folder index so rescans only re-list changed folders
+import os
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import closing
+
+from scanner import iter_files, list_folder
+
+SCHEMA_VERSION = 1
+# Folder mtimes closer to "now" than this may still change within the same
+# timestamp tick (FAT/SMB have 2 s resolution), so they are never trusted.
+RACY_WINDOW_NS = 2_000_000_000
+SEP = "\0"
+
+
+class FileIndex:
+    """
+    SQLite cache of folder listings keyed on folder path and mtime.
+    A folder is only re-listed when its mtime changed since the last scan,
+    so a rescan of a known tree costs one stat() per folder.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path))
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS folders")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS folders ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, "
+            "dirs TEXT NOT NULL, files TEXT NOT NULL)"
+        )
+        return conn
+
+    def scan(self, root, extensions, finalize=False):
+        """Scan root like scanner.scan_files, reusing unchanged folder listings"""
+        files = self.iter_scan(root, extensions, finalize)
+        return sorted(files, key=lambda p: p.name.lower())
+
+    def iter_scan(self, root, extensions, finalize=False, cancel=None, stats=None):
+        """
+        Yield matching files (unsorted) as folders are visited, then save the index.
+        If given, `stats` is filled with "stat_calls" and "listdir_calls".
+        """
+        stats = {} if stats is None else stats
+        stats.update(stat_calls=0, listdir_calls=0)
+        with self.lock:
+            try:
+                conn = self._connect()
+            except sqlite3.Error as e:
+                logging.warning(f"File index unavailable, full scan: {e}")
+
+                def lister(folder):
+                    stats["listdir_calls"] += 1
+                    return list_folder(folder)
+
+                yield from iter_files(root, extensions, finalize, lister, cancel)
+                return
+            with closing(conn):
+                yield from self._iter_scan(conn, os.fspath(root), extensions, finalize, cancel, stats)
+
+    def _iter_scan(self, conn, root, extensions, finalize, cancel, stats):
+        cached = self._load_subtree(conn, root)
+        updated = {}
+        gone = []
+
+        def lister(folder):
+            stats["stat_calls"] += 1
+            try:
+                mtime_ns = os.stat(folder).st_mtime_ns
+            except FileNotFoundError:
+                gone.append(folder)
+                raise
+            entry = cached.get(folder)
+            if entry and entry[0] == mtime_ns:
+                return entry[1], entry[2]
+            stats["listdir_calls"] += 1
+            dirs, files = list_folder(folder)
+            if time.time_ns() - mtime_ns < RACY_WINDOW_NS:
+                mtime_ns = -1
+            if entry:
+                gone.extend(os.path.join(folder, d) for d in set(entry[1]) - set(dirs))
+            updated[folder] = (mtime_ns, dirs, files)
+            return dirs, files
+
+        try:
+            yield from iter_files(root, extensions, finalize, lister, cancel)
+        finally:
+            # Listings gathered before a cancel are still valid, keep them
+            self._save(conn, updated, gone)
+
+    def _save(self, conn, updated, gone):
+        try:
+            with conn:
+                for folder in gone:
+                    self._delete_subtree(conn, folder)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO folders VALUES (?, ?, ?, ?)",
+                    [(path, m, SEP.join(d), SEP.join(f)) for path, (m, d, f) in updated.items()]
+                )
+        except sqlite3.Error as e:
+            logging.warning(f"File index save failed: {e}")
+            return
+        if updated or gone:
+            logging.info(f"File index: {len(updated)} folders re-listed, {len(gone)} removed")
+
+    def _load_subtree(self, conn, root):
+        lo, hi = self._subtree_range(root)
+        rows = conn.execute(
+            "SELECT path, mtime_ns, dirs, files FROM folders "
+            "WHERE path = ? OR (path >= ? AND path < ?)", (root, lo, hi)
+        )
+        return {
+            path: (mtime_ns, dirs.split(SEP) if dirs else [], files.split(SEP) if files else [])
+            for path, mtime_ns, dirs, files in rows
+        }
+
+    def _delete_subtree(self, conn, folder):
+        lo, hi = self._subtree_range(folder)
+        conn.execute(
+            "DELETE FROM folders WHERE path = ? OR (path >= ? AND path < ?)", (folder, lo, hi)
+        )
+
+    @staticmethod
+    def _subtree_range(folder):
+        prefix = os.path.join(folder, "")
+        return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
@@ -0,0 +1,160 @@
+# file_model.py - In-memory model of the scanned file list, updated by deltas
+import os
+import time
+import bisect
+import threading
+from pathlib import Path
+
+from scanner import is_done_folder
+
+# Quiet period before queued watchdog events are applied, and the longest a
+# steady stream of events may hold them back.
+DEBOUNCE_MS = 300
+MAX_DELAY_MS = 2000
+
+
+def sort_key(path):
+    return (path.name.lower(), str(path))
+
+
+class FileListModel:
+    """
+    Sorted list of the files shown in the UI.
+    Watchdog events are applied as adds, removes and moves so the cost
+    follows the number of events, not the size of the tree.
+    """
+
+    def __init__(self, extensions, search_index=None):
+        self.exts = frozenset(ext.lower() for ext in extensions)
+        self.search_index = search_index
+        self.root = None
+        self.finalize = False
+        self.paths = []
+        self._keys = []
+
+    def reset(self, root, finalize, files):
+        """Replace the whole list with the result of a full scan"""
+        self.root = Path(root) if root else None
+        self.finalize = finalize
+        self.paths = sorted(files, key=sort_key)
+        self._keys = [sort_key(p) for p in self.paths]
+        if self.search_index is not None:
+            self.search_index.rebuild(self.paths)
+
+    def accepts(self, path):
+        """Apply the scanner's Done/ and extension rules to a single path"""
+        if self.root is None or path.suffix.lower() not in self.exts:
+            return False
+        try:
+            folders = path.relative_to(self.root).parts[:-1]
+        except ValueError:
+            return False
+        done = [is_done_folder(name) for name in folders]
+        if not self.finalize:
+            return not any(done)
+        return bool(done) and done[-1] and not any(done[:-1]) and "[ok]" not in path.name
+
+    def add(self, path):
+        key = sort_key(path)
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return False
+        self._keys.insert(i, key)
+        self.paths.insert(i, path)
+        if self.search_index is not None:
+            self.search_index.add(path)
+        return True
+
+    def remove(self, path):
+        key = sort_key(path)
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+            del self.paths[i]
+            if self.search_index is not None:
+                self.search_index.remove(path)
+            return True
+        return False
+
+    def remove_tree(self, folder):
+        prefix = os.path.join(str(folder), "")
+        keep = [i for i, p in enumerate(self.paths) if not str(p).startswith(prefix)]
+        if len(keep) == len(self.paths):
+            return False
+        if self.search_index is not None:
+            kept = set(keep)
+            for i, p in enumerate(self.paths):
+                if i not in kept:
+                    self.search_index.remove(p)
+        self.paths = [self.paths[i] for i in keep]
+        self._keys = [self._keys[i] for i in keep]
+        return True
+
+    def add_tree(self, folder):
+        changed = False
+        for dirpath, _, files in os.walk(folder):
+            for name in files:
+                path = Path(dirpath, name)
+                if self.accepts(path):
+                    changed = self.add(path) or changed
+        return changed
+
+    def apply(self, events):
+        """Apply (kind, src, dest, is_dir) events; return True if the list changed"""
+        changed = False
+        for kind, src, dest, is_dir in events:
+            src = Path(src)
+            if is_dir:
+                if kind in ("deleted", "moved"):
+                    changed = self.remove_tree(src) or changed
+                if kind == "created":
+                    changed = self.add_tree(src) or changed
+                elif kind == "moved":
+                    changed = self.add_tree(dest) or changed
+                continue
+            if kind in ("deleted", "moved"):
+                changed = self.remove(src) or changed
+            target = src if kind == "created" else Path(dest) if kind == "moved" else None
+            if target is not None and self.accepts(target):
+                changed = self.add(target) or changed
+        return changed
+
+
+class EventBatcher:
+    """
+    Collects events from the watchdog thread and hands them to the Tk
+    thread in one batch once the folder has been quiet for DEBOUNCE_MS.
+    """
+
+    def __init__(self, app, callback):
+        self.app = app
+        self.callback = callback
+        self.lock = threading.Lock()
+        self.pending = []
+        self.first = self.last = 0.0
+        self.scheduled = False
+
+    def push(self, event):
+        with self.lock:
+            now = time.monotonic()
+            if not self.pending:
+                self.first = now
+            self.pending.append(event)
+            self.last = now
+            if self.scheduled:
+                return
+            self.scheduled = True
+        self.app.after(DEBOUNCE_MS, self._flush)
+
+    def _flush(self):
+        with self.lock:
+            now = time.monotonic()
+            quiet = (now - self.last) * 1000 >= DEBOUNCE_MS
+            overdue = (now - self.first) * 1000 >= MAX_DELAY_MS
+            if not quiet and not overdue:
+                self.app.after(DEBOUNCE_MS, self._flush)
+                return
+            events, self.pending = self.pending, []
+            self.scheduled = False
+        if events:
+            self.callback(events)
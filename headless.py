@@ -0,0 +1,100 @@
+# headless.py - Batch renaming without the GUI (cron jobs, file server)
+#
+# Usage: python main.py --headless --root "E:/2025" --machine "(C.S)" [--dry-run]
+import argparse
+import csv
+import logging
+import sys
+from pathlib import Path
+
+from core import (
+    ALLOWED_EXTENSIONS, DEFAULT_KEYWORDS, DEFAULT_MACHINE, DONE_FOLDER_NAME,
+    folder_names, move_to_done, plan_new_name, read_party_map, read_quantity_keywords
+)
+from naming import NamingEngine
+from parties import PartyMap
+from plt_extents import PlotSizes, needs_plot_size
+from scanner import scan_files
+
+project_dir = Path(__file__).parent
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="main.py --headless", description="Rename new files into their Done folders")
+    parser.add_argument("--headless", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--root", required=True, help="Year folder to process (e.g. E:/2025)")
+    parser.add_argument("--machine", default=DEFAULT_MACHINE, help="Machine tag, e.g. \"(C.S)\" or \"(C.E)\"")
+    parser.add_argument("--parties", default=str(project_dir / "codes" / "parties.csv"))
+    parser.add_argument("--keywords", default=str(project_dir / "config" / "keywords.json"))
+    parser.add_argument("--fuzzy-parties", action="store_true", help="Match party folders with small typos")
+    parser.add_argument("--no-plot-size", action="store_true", help="Don't read the size of unsized PLT files from their contents")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the planned names")
+    return parser.parse_args(argv)
+
+
+def rename_tree(root, party_map, naming, machine, dry_run=False, plot_sizes=None):
+    """
+    Rename every new file under root; returns (renamed, skipped, failed).
+    With plot_sizes (PlotSizes), PLT files without a size in the name are
+    measured from their contents first, all in one batch.
+    """
+    renamed = skipped = failed = 0
+    listings = {}  # party folder → Done names, listed once per folder
+    files = scan_files(root, ALLOWED_EXTENSIONS)
+    sizes = {}
+    if plot_sizes:
+        try:
+            sizes = plot_sizes.measure([p for p in files if needs_plot_size(p, naming)])
+        except Exception as e:
+            logging.warning(f"Plot size measuring failed, using file names only: {e}")
+    for file_path in files:
+        new_name = plan_new_name(file_path, party_map, naming, machine, sizes.get(file_path))
+        if new_name is None:
+            skipped += 1
+            logging.info(f"Skipped (no party code): {file_path}")
+            continue
+        if dry_run:
+            print(f"{file_path} → {new_name}")
+            renamed += 1
+            continue
+        try:
+            taken = listings.get(file_path.parent)
+            if taken is None:
+                taken = listings[file_path.parent] = folder_names(file_path.parent / DONE_FOLDER_NAME)
+            final_path = move_to_done(file_path, new_name, taken)
+            logging.info(f"Renamed: {file_path} → {final_path}")
+            renamed += 1
+        except OSError as e:
+            logging.error(f"Rename failed for {file_path}: {e}")
+            failed += 1
+    return renamed, skipped, failed
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    root = Path(args.root)
+    if not root.is_dir():
+        logging.error(f"Root folder not found: {root}")
+        return 2
+    try:
+        party_map = PartyMap(read_party_map(args.parties), fuzzy=args.fuzzy_parties)
+    except (OSError, csv.Error) as e:
+        logging.error(f"Failed to load parties: {e}")
+        return 2
+    try:
+        keywords = read_quantity_keywords(args.keywords)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Failed to load keywords, using defaults: {e}")
+        keywords = DEFAULT_KEYWORDS
+    plot_sizes = None if args.no_plot_size else PlotSizes(project_dir / "plot_sizes.db")
+    renamed, skipped, failed = rename_tree(
+        root, party_map, NamingEngine(keywords), args.machine, args.dry_run, plot_sizes
+    )
+    action = "planned" if args.dry_run else "renamed"
+    logging.info(f"Headless batch: {renamed} {action}, {skipped} skipped, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+# history.py - Undo/redo history backed by an append-only rename journal
+import os
+import json
+import time
+import logging
+from datetime import datetime
+from pathlib import Path
+
+# Records reach the OS on every write; fsync happens at most this often,
+# every FSYNC_EVERY records, or when sync()/close() is called.
+FSYNC_INTERVAL = 1.0
+FSYNC_EVERY = 64
+# Compaction keeps the journal near the live history and caps undo depth
+MAX_ENTRIES = 20000
+COMPACT_SLACK = 1000
+
+
+class RenameHistory:
+    """
+    Undo/redo cursor over renames.
+    Every operation is appended to a JSON-lines journal ("add", "undo",
+    "redo", "clear"), so history survives restarts and crashes; replaying
+    the journal on startup restores the cursor. Without a journal path the
+    history is memory-only.
+    """
+
+    def __init__(self, journal_path=None):
+        self.journal_path = Path(journal_path) if journal_path else None
+        self.entries = []
+        self.size = 0
+        self.index = -1
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        if self.journal_path:
+            self._load()
+
+    def __len__(self):
+        return self.size
+
+    # ---------- Journal ----------
+
+    def _load(self):
+        records = 0
+        # A crash mid-write leaves a last line without its newline: a torn one
+        # is cut off, a complete one is terminated, so appends start on a new line
+        torn = unterminated = False
+        offset = 0
+        try:
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    offset += len(line)
+                    unterminated = not line.endswith(b"\n")
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        logging.warning(f"Skipped torn journal line at byte {offset}")
+                        torn = unterminated
+                        continue
+                    records += 1
+                    self._replay(record)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error(f"Rename journal unreadable, starting empty: {e}")
+        if torn:
+            try:
+                os.truncate(self.journal_path, offset - len(line))
+            except OSError as e:
+                logging.error(f"Rename journal torn tail not removed: {e}")
+            unterminated = False
+        if records > 2 * self.size + COMPACT_SLACK or self.size > MAX_ENTRIES:
+            if self._compact():
+                unterminated = False
+        try:
+            self._file = open(self.journal_path, "a", encoding="utf-8")
+            if unterminated:
+                self._file.write("\n")
+        except OSError as e:
+            logging.error(f"Rename journal not writable, history is memory-only: {e}")
+
+    def _replay(self, record):
+        op = record.get("op")
+        if op == "add":
+            self._push({k: v for k, v in record.items() if k != "op"})
+        elif op == "undo" and self.index >= 0:
+            self.index -= 1
+        elif op == "redo" and self.index < self.size - 1:
+            self.index += 1
+        elif op == "clear":
+            self._reset()
+        elif op == "drop":
+            self._drop_batch(record.get("batch"))
+
+    def _write(self, record):
+        if not self._file:
+            return
+        try:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+            self._unsynced += 1
+            if self._unsynced >= FSYNC_EVERY or time.monotonic() - self._last_sync >= FSYNC_INTERVAL:
+                self.sync()
+        except OSError as e:
+            logging.error(f"Rename journal write failed: {e}")
+
+    def sync(self):
+        """Force journal records written so far to disk"""
+        if self._file and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._file:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def _compact(self):
+        """Rewrite the journal as the live entries plus the cursor position; False if it failed"""
+        dropped = max(0, self.size - MAX_ENTRIES)
+        live = self.entries[dropped:self.size]
+        index = max(-1, self.index - dropped)
+        tmp_path = self.journal_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for item in live:
+                    f.write(json.dumps({"op": "add", **item}) + "\n")
+                for _ in range(len(live) - 1 - index):
+                    f.write(json.dumps({"op": "undo"}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.journal_path)
+        except OSError as e:
+            logging.error(f"Rename journal compaction failed: {e}")
+            return False
+        self.entries = live
+        self.size = len(live)
+        self.index = index
+        return True
+
+    # ---------- History ----------
+
+    def _push(self, item):
+        # Overwrite the redo tail in place instead of copying the list
+        pos = self.index + 1
+        if pos < len(self.entries):
+            self.entries[pos] = item
+        else:
+            self.entries.append(item)
+        self.index = pos
+        self.size = pos + 1
+
+    def _reset(self):
+        self.entries = []
+        self.size = 0
+        self.index = -1
+
+    def add(self, old, new, batch=None):
+        item = {
+            "old": str(old),
+            "new": str(new),
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        if batch:
+            item["batch"] = batch
+        self._push(item)
+        self._write({"op": "add", **item})
+
+    def has_batch(self, batch):
+        return any(item.get("batch") == batch for item in self.entries[:self.size])
+
+    def batches(self):
+        """(batch id, file count, timestamp) of undoable batches, newest first"""
+        found = {}
+        for item in self.entries[:self.index + 1]:
+            batch = item.get("batch")
+            if batch:
+                count, _ = found.get(batch, (0, None))
+                found[batch] = (count + 1, item["timestamp"])
+        return [(batch, count, ts) for batch, (count, ts) in reversed(found.items())]
+
+    def _drop_batch(self, batch):
+        live = self.entries[:self.size]
+        keep = [i for i, item in enumerate(live) if item.get("batch") != batch]
+        self.index = sum(1 for i in keep if i <= self.index) - 1
+        self.entries = [live[i] for i in keep]
+        self.size = len(self.entries)
+
+    def take_batch(self, batch):
+        """Remove one batch from history; returns its applied items, newest first"""
+        items = [item for item in self.entries[:self.index + 1] if item.get("batch") == batch]
+        self._drop_batch(batch)
+        self._write({"op": "drop", "batch": batch})
+        return items[::-1]
+
+    def take_all(self):
+        """Clear history; returns every applied item, newest first"""
+        items = self.entries[:self.index + 1][::-1]
+        self.clear()
+        return items
+
+    def undo(self):
+        if self.index < 0:
+            return None
+        item = self.entries[self.index]
+        self.index -= 1
+        self._write({"op": "undo"})
+        return item
+
+    def redo(self):
+        if self.index >= self.size - 1:
+            return None
+        self.index += 1
+        self._write({"op": "redo"})
+        return self.entries[self.index]
+
+    def clear(self):
+        self._reset()
+        self._write({"op": "clear"})
+
+    def iter_export(self):
+        """Yield the renames in history (undone ones included until overwritten), oldest first"""
+        yield from self.entries[:self.size]
@@ -0,0 +1,101 @@
+# log_setup.py - Non-blocking logging: records go through a queue to a listener thread
+import os
+import atexit
+import logging
+import logging.handlers
+import queue
+from datetime import date
+from pathlib import Path
+
+LOG_FORMAT = "%(asctime)s | %(levelname)s | %(message)s"
+# A day's log rolls to <date>.1.log, <date>.2.log, ... past this size
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 5
+# Batch summaries quote this many per-file errors, the report has the rest
+SUMMARY_SAMPLES = 10
+
+
+class DailyLogHandler(logging.handlers.BaseRotatingHandler):
+    """
+    Writes logs/<date>.log, switching to a new file when the date changes
+    and rolling the current day's file once it exceeds max_bytes.
+    """
+
+    def __init__(self, folder, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUPS):
+        self.folder = Path(folder)
+        self.day = date.today()
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        super().__init__(self._path(self.day), "a", encoding="utf-8", delay=True)
+
+    def _path(self, day, n=0):
+        suffix = f".{n}" if n else ""
+        return str(self.folder / f"{day.isoformat()}{suffix}.log")
+
+    def shouldRollover(self, record):
+        if date.today() != self.day:
+            return True
+        if not self.max_bytes:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        self.stream.seek(0, 2)
+        return self.stream.tell() + len(self.format(record)) + 1 >= self.max_bytes
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        today = date.today()
+        if today != self.day:
+            self.day = today
+        else:
+            for n in range(self.backup_count - 1, 0, -1):
+                src = self._path(today, n)
+                if os.path.exists(src):
+                    os.replace(src, self._path(today, n + 1))
+            if self.backup_count:
+                os.replace(self.baseFilename, self._path(today, 1))
+            else:
+                os.remove(self.baseFilename)
+        self.baseFilename = os.path.abspath(self._path(self.day))
+
+
+def setup_logging(folder, level=logging.INFO):
+    """
+    Route the root logger through a QueueHandler: callers only enqueue, a
+    listener thread formats and writes to the daily file and the console.
+    The listener is flushed and stopped at exit.
+    """
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [DailyLogHandler(folder), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def log_batch_summary(action, counts, errors=(), batch_id=None):
+    """
+    One record per batch instead of one per file: the counts plus the first
+    few errors (strings); logged as a warning when anything failed.
+    """
+    label = f"{action} {batch_id}" if batch_id else action
+    message = f"{label}: " + ", ".join(f"{n} {what}" for what, n in counts.items())
+    errors = list(errors)
+    if errors:
+        sample = "; ".join(errors[:SUMMARY_SAMPLES])
+        more = f" (+{len(errors) - SUMMARY_SAMPLES} more)" if len(errors) > SUMMARY_SAMPLES else ""
+        logging.warning(f"{message} | errors: {sample}{more}")
+    else:
+        logging.info(message)
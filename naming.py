@@ -0,0 +1,118 @@
+# naming.py - Precompiled naming rules: dimensions, quantity and new file names
+import re
+from functools import lru_cache
+
+CACHE_SIZE = 1 << 17
+
+WHITESPACE_RE = re.compile(r'\s+')
+DIMENSION_RE = re.compile(r'(\d+\.?\d*)\s*x\s*(\d+\.?\d*)')
+DIMENSION_TOKEN_RE = re.compile(r'\d+\s*x\s*\d+')
+QTY_TOKEN_RE = re.compile(r'\(Q\.(\d+)\)')
+QTY_SUFFIX_RE = re.compile(r'\(Q\.\d+\)%%?')
+
+
+def to_feet(inch):
+    """Custom bucket rules: inches → feet"""
+    if inch <= 20: return 1
+    elif inch <= 26: return 2
+    elif inch <= 38: return 3
+    elif inch <= 50: return 4
+    elif inch <= 62: return 5
+    elif inch <= 74: return 6
+    elif inch <= 98: return 8
+    else: return 10
+
+
+def feet_size(width_in, height_in) -> str:
+    """Inches → "WxH" in feet by the bucket rules, at least 2 sq ft (1x2)"""
+    w_ft = to_feet(width_in)
+    h_ft = to_feet(height_in)
+    if w_ft * h_ft < 2:
+        w_ft, h_ft = 1, 2
+    return f"{w_ft}x{h_ft}"
+
+
+def quantity_token(stem: str) -> int:
+    """Quantity from a renamed file's (Q.n) token, 1 if there is none"""
+    match = QTY_TOKEN_RE.search(stem)
+    return int(match.group(1)) if match else 1
+
+
+def finalized_filename(stem: str, extension: str, qty, cat: str = "", machine: str = "") -> str:
+    """Done file name with the final quantity, %cat% marker and [ok] after the machine tag"""
+    base = QTY_SUFFIX_RE.split(stem)[0] if "(Q." in stem else stem
+    if machine and machine in base and "[ok]" not in base:
+        base = base.replace(machine, f"{machine}[ok]")
+    marker = f"%{cat}%" if cat else "%%"
+    return f"{base}(Q.{qty}){marker}{extension}"
+
+
+class NamingEngine:
+    """
+    Naming rules with every regex compiled once.
+    All quantity keywords share one pattern that is rebuilt only when the
+    keyword list changes; results are memoized per file name.
+    """
+
+    def __init__(self, quantity_keywords=()):
+        self.keywords = None
+        self.extract_dimensions = lru_cache(maxsize=CACHE_SIZE)(self._extract_dimensions)
+        self.set_keywords(quantity_keywords)
+
+    def set_keywords(self, quantity_keywords):
+        """Recompile the quantity pattern if the keyword list changed"""
+        keywords = tuple(quantity_keywords)
+        if keywords == self.keywords:
+            return
+        self.keywords = keywords
+        # Earlier keywords win, as when each keyword was tried in turn
+        self.priority = {}
+        for kw in keywords:
+            self.priority.setdefault(kw, len(self.priority))
+        if keywords:
+            alternation = "|".join(re.escape(kw) for kw in self.priority)
+            # Zero-width lookaheads find matches at every position, even overlapping ones
+            self.quantity_re = re.compile(
+                rf'(?=\b(\d+)\s*({alternation})\b)|(?=\b({alternation})\s*(\d+)\b)'
+            )
+        else:
+            self.quantity_re = None
+        self.detect_quantity = lru_cache(maxsize=CACHE_SIZE)(self._detect_quantity)
+
+    def _extract_dimensions(self, filename: str) -> str:
+        """Extract dimensions and convert to feet using custom bucket rules"""
+        match = DIMENSION_RE.search(filename.lower())
+        if not match:
+            return ""
+        return feet_size(float(match.group(1)), float(match.group(2)))
+
+    def _detect_quantity(self, filename: str) -> int:
+        """
+        Detect quantity only from numbers adjacent to keywords.
+        Ignores dimensions like '60 x 36'.
+        """
+        if self.quantity_re is None:
+            return 1
+        clean = WHITESPACE_RE.sub(' ', filename.strip().lower())
+        # Remove dimension part first
+        clean = DIMENSION_TOKEN_RE.sub('', clean)
+        clean = WHITESPACE_RE.sub(' ', clean).strip()
+
+        best = None
+        for match in self.quantity_re.finditer(clean):
+            num_before, kw_after, kw_before, num_after = match.groups()
+            if num_before is not None:
+                rank = (self.priority[kw_after], 0)
+                qty = num_before
+            else:
+                rank = (self.priority[kw_before], 1)
+                qty = num_after
+            if best is None or rank < best[0]:
+                best = (rank, qty)
+        return int(best[1]) if best else 1  # Default
+
+    def generate_new_filename(self, original_stem: str, party_code: str, extension: str,
+                              dim_str: str = "", machine: str = "") -> str:
+        qty = self.detect_quantity(original_stem)
+        dim_part = f"(FT.{dim_str})" if dim_str else ""
+        return f"{party_code}_{original_stem} {machine}{dim_part}(Q.{qty})%%{extension}"
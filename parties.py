@@ -0,0 +1,84 @@
+# parties.py - Party folder name → code lookup that tolerates naming variants
+from collections import Counter
+
+# Fuzzy matches below this trigram similarity (Dice coefficient) are rejected
+FUZZY_THRESHOLD = 0.8
+
+
+def normalize_party(name: str) -> str:
+    """Lookup key: casefolded with whitespace runs collapsed to one space"""
+    return " ".join(name.split()).casefold()
+
+
+def trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PartyMap:
+    """
+    Read-only mapping of party folder names to codes.
+    get() tries the exact name, then the normalized key ("pranam  MAHETA"
+    finds "Pranam Maheta"). With fuzzy=True a last resort compares
+    trigrams through an inverted index, so only parties sharing a trigram
+    with the folder name are scored. Results are memoized per folder name.
+    """
+
+    def __init__(self, entries=None, fuzzy=False):
+        self.exact = dict(entries or {})
+        self.fuzzy = fuzzy
+        self.by_key = {}
+        for name, code in self.exact.items():
+            self.by_key.setdefault(normalize_party(name), code)
+        self.grams = {}
+        self.postings = {}
+        if fuzzy:
+            for key in self.by_key:
+                grams = trigrams(key)
+                self.grams[key] = grams
+                for gram in grams:
+                    self.postings.setdefault(gram, []).append(key)
+        self._memo = {}
+
+    def __len__(self):
+        return len(self.exact)
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def items(self):
+        return self.exact.items()
+
+    def get(self, name, default=None):
+        try:
+            code = self._memo[name]
+        except KeyError:
+            code = self._memo[name] = self._resolve(name)
+        return default if code is None else code
+
+    def _resolve(self, name):
+        code = self.exact.get(name)
+        if code is not None:
+            return code
+        key = normalize_party(name)
+        code = self.by_key.get(key)
+        if code is not None or not self.fuzzy or not key:
+            return code
+        return self._fuzzy(key)
+
+    def _fuzzy(self, key):
+        """Closest party by trigram similarity; ties between codes match nothing"""
+        grams = trigrams(key)
+        shared = Counter(k for gram in grams for k in self.postings.get(gram, ()))
+        best_code, best_score = None, 0.0
+        for candidate, common in shared.items():
+            score = 2 * common / (len(grams) + len(self.grams[candidate]))
+            if score < FUZZY_THRESHOLD or score < best_score:
+                continue
+            code = self.by_key[candidate]
+            if score == best_score and code != best_code:
+                best_code = None
+            else:
+                best_code = code
+            best_score = score
+        return best_code
@@ -0,0 +1,118 @@
+# perf.py - Structured timings and counters for scans, renames and UI refreshes
+import json
+import time
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+# Records kept in memory for the stats panel
+PERF_HISTORY = 200
+
+
+class Span:
+    """
+    One timed operation. Counters can be added while it runs (also from
+    other callbacks, e.g. per scan batch); finish() stamps the wall time
+    and hands the record to the recorder. Usable as a context manager.
+    """
+
+    def __init__(self, recorder, op, fields):
+        self.recorder = recorder
+        self.op = op
+        self.fields = dict(fields)
+        self.t0 = time.perf_counter()
+        self.finished = False
+
+    def add(self, key, amount=1):
+        self.fields[key] = self.fields.get(key, 0) + amount
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def add_ms(self, key, since):
+        """Add the ms elapsed since perf_counter() value `since` to a counter"""
+        self.add(key, round((time.perf_counter() - since) * 1000, 2))
+
+    def finish(self, **fields):
+        if self.finished:
+            return
+        self.finished = True
+        self.fields.update(fields)
+        self.recorder.record(self.op, (time.perf_counter() - self.t0) * 1000, self.fields)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.fields["error"] = exc_type.__name__
+        self.finish()
+        return False
+
+
+class PerfRecorder:
+    """
+    Collects finished spans as JSON lines ({"ts", "op", "wall_ms", ...}).
+    Records are appended to `path` (if given), kept in a short in-memory
+    history and folded into per-operation totals for the stats panel.
+    Thread-safe; a failing write only logs a warning.
+    """
+
+    def __init__(self, path=None, history=PERF_HISTORY):
+        self.path = Path(path) if path else None
+        self.lock = threading.Lock()
+        self.recent = deque(maxlen=history)
+        self.totals = {}
+        self._file = None
+
+    def span(self, op, **fields) -> Span:
+        return Span(self, op, fields)
+
+    def record(self, op, wall_ms, fields):
+        rec = {"ts": datetime.now().isoformat(timespec="milliseconds"), "op": op, "wall_ms": round(wall_ms, 1)}
+        rec.update(fields)
+        with self.lock:
+            self.recent.append(rec)
+            total = self.totals.setdefault(op, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0})
+            total["count"] += 1
+            total["total_ms"] += wall_ms
+            total["max_ms"] = max(total["max_ms"], wall_ms)
+            total["last_ms"] = wall_ms
+            self._write(rec)
+
+    def _write(self, rec):
+        if not self.path:
+            return
+        try:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(rec, ensure_ascii=False, default=str) + "\n")
+            self._file.flush()
+        except OSError as e:
+            logging.warning(f"Perf log write failed: {e}")
+
+    def summary(self) -> dict:
+        """op → {"count", "avg_ms", "max_ms", "last_ms"}"""
+        with self.lock:
+            return {
+                op: {
+                    "count": t["count"],
+                    "avg_ms": round(t["total_ms"] / t["count"], 1),
+                    "max_ms": round(t["max_ms"], 1),
+                    "last_ms": round(t["last_ms"], 1),
+                }
+                for op, t in self.totals.items()
+            }
+
+    def recent_records(self, limit=None) -> list:
+        with self.lock:
+            records = list(self.recent)
+        return records[-limit:] if limit else records
+
+    def close(self):
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
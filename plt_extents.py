@@ -0,0 +1,195 @@
+# plt_extents.py - True plot size read from PLT (HPGL) contents, cached per file version
+import os
+import re
+import mmap
+import sqlite3
+import logging
+import threading
+from contextlib import closing
+from itertools import accumulate
+
+SCHEMA_VERSION = 1
+# HPGL plotter units: 40 per mm
+PLU_PER_INCH = 1016
+PLOT_EXTENSIONS = {".plt"}
+# Files parsed in the calling process below this count; a pool is not worth starting
+POOL_MIN_FILES = 4
+PARSE_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+# A run of up to 4096 same pen commands with their coordinates: "PD100,200;PD300,400;".
+# Cutter files send one point per command, so matching runs keeps the loop
+# out of Python per point, and the cap keeps the parsed slice small.
+PEN_RUN_RE = re.compile(rb'P([UDAR])([-+\d.,\s]*(?:;\s*P\1[-+\d.,\s]*){0,4095})')
+NUMBER_RE = re.compile(rb'[-+]?\d+(?:\.\d*)?')
+
+
+def scan_extents(buf):
+    """
+    Bounding box (width, height) in plotter units of what the pen draws:
+    the points of PD strokes, tracking PA/PR absolute and relative mode
+    and pen moves made with PU. `buf` is any bytes-like object (an mmap).
+    None if nothing is drawn.
+    """
+    x = y = 0.0
+    relative = pen_down = False
+    min_x = min_y = float("inf")
+    max_x = max_y = float("-inf")
+    for match in PEN_RUN_RE.finditer(buf):
+        cmd = match.group(1)
+        if cmd == b"U":
+            pen_down = False
+        elif cmd == b"D":
+            pen_down = True
+        elif cmd == b"A":
+            relative = False
+        else:
+            relative = True
+        values = list(map(float, NUMBER_RE.findall(match.group(2))))
+        n = len(values) // 2
+        if not n:
+            continue
+        xs, ys = values[0:2 * n:2], values[1:2 * n:2]
+        if relative:
+            xs = list(accumulate(xs, initial=x))
+            ys = list(accumulate(ys, initial=y))
+        elif pen_down:
+            # A stroke starts at the current pen position; the last point stays last
+            xs.insert(0, x)
+            ys.insert(0, y)
+        if pen_down:
+            min_x, max_x = min(min_x, min(xs)), max(max_x, max(xs))
+            min_y, max_y = min(min_y, min(ys)), max(max_y, max(ys))
+        x, y = xs[-1], ys[-1]
+    if min_x > max_x:
+        return None
+    return max_x - min_x, max_y - min_y
+
+
+def plot_extents(path):
+    """
+    Drawn size of a PLT file in inches, (width, height), or None.
+    The file is memory-mapped, so a multi-hundred-MB plot is streamed
+    through the OS page cache instead of being read into memory.
+    Raises OSError if the file cannot be read.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            extents = scan_extents(buf)
+    if extents is None:
+        return None
+    return round(extents[0] / PLU_PER_INCH, 2), round(extents[1] / PLU_PER_INCH, 2)
+
+
+def _parse_one(path):
+    """(ok, extents); a failed read is not cached, the file may still be copying"""
+    try:
+        return True, plot_extents(path)
+    except OSError as e:
+        logging.warning(f"Plot size read failed for {path}: {e}")
+        return False, None
+
+
+def _parse_many(paths, workers):
+    """_parse_one() of every path, on a process pool when there are enough"""
+    if workers <= 1 or len(paths) < POOL_MIN_FILES:
+        return [_parse_one(p) for p in paths]
+    # Imported here: the pool is only needed when a batch has unsized plots
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    # spawn, not fork: the GUI calls this from a worker thread next to Tk
+    context = multiprocessing.get_context("spawn")
+    try:
+        with ProcessPoolExecutor(min(workers, len(paths)), mp_context=context) as pool:
+            return list(pool.map(_parse_one, paths, chunksize=max(1, len(paths) // (workers * 4))))
+    except (OSError, BrokenProcessPool) as e:
+        logging.warning(f"Plot size pool failed, parsing {len(paths)} files inline: {e}")
+        return [_parse_one(p) for p in paths]
+
+
+class PlotSizes:
+    """
+    SQLite cache of plot_extents() keyed on path, size and mtime, so each
+    version of a file is parsed once. measure() parses the misses of a
+    batch on a process pool; cached() never parses.
+    """
+
+    def __init__(self, db_path, workers=PARSE_WORKERS):
+        self.db_path = db_path
+        self.workers = workers
+        self.lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path))
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS plots")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        # width/height NULL: parsed, but nothing is drawn
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS plots ("
+            "path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+            "width REAL, height REAL)"
+        )
+        return conn
+
+    @staticmethod
+    def _versions(paths) -> dict:
+        versions = {}
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            versions[str(path)] = (st.st_size, st.st_mtime_ns)
+        return versions
+
+    def _lookup(self, conn, versions) -> dict:
+        found = {}
+        for key, (size, mtime_ns) in versions.items():
+            row = conn.execute("SELECT size, mtime_ns, width, height FROM plots WHERE path = ?", (key,)).fetchone()
+            if row and row[0] == size and row[1] == mtime_ns:
+                found[key] = (row[2], row[3]) if row[2] is not None else None
+        return found
+
+    def cached(self, paths) -> dict:
+        """path → (width, height) inches or None, only for files parsed at their current version"""
+        versions = self._versions(paths)
+        try:
+            with self.lock, closing(self._connect()) as conn:
+                found = self._lookup(conn, versions)
+        except sqlite3.Error as e:
+            logging.warning(f"Plot size cache unavailable: {e}")
+            return {}
+        return {p: found[str(p)] for p in paths if str(p) in found}
+
+    def measure(self, paths) -> dict:
+        """path → (width, height) inches or None, parsing the files not cached yet"""
+        versions = self._versions(paths)
+        try:
+            with self.lock, closing(self._connect()) as conn:
+                found = self._lookup(conn, versions)
+        except sqlite3.Error as e:
+            logging.warning(f"Plot size cache unavailable: {e}")
+            found = {}
+        missing = [key for key in versions if key not in found]
+        if missing:
+            rows = []
+            for key, (ok, extents) in zip(missing, _parse_many(missing, self.workers)):
+                if ok:
+                    found[key] = extents
+                    rows.append((key, *versions[key], *(extents or (None, None))))
+            try:
+                with self.lock, closing(self._connect()) as conn, conn:
+                    conn.executemany("INSERT OR REPLACE INTO plots VALUES (?, ?, ?, ?, ?)", rows)
+            except sqlite3.Error as e:
+                logging.warning(f"Plot size cache write failed: {e}")
+            logging.info(f"Plot sizes: parsed {len(missing)} files, {len(versions) - len(missing)} cached")
+        return {p: found[str(p)] for p in paths if str(p) in found}
+
+
+def needs_plot_size(file_path, naming) -> bool:
+    """A plot file whose name carries no WxH size"""
+    return file_path.suffix.lower() in PLOT_EXTENSIONS and not naming.extract_dimensions(file_path.name)
@@ -0,0 +1,241 @@
+# rename_plan.py - Dry-run rename plan for the listed files, built in the background
+import os
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from core import DONE_FOLDER_NAME, folder_names, free_name, same_content
+from naming import feet_size
+from plt_extents import needs_plot_size
+
+
+def plan_folder(files, party_map, naming, machine, taken=None, check_duplicates=False, plot_sizes=None) -> dict:
+    """
+    Plan entries for files of one party folder (in list order):
+    {"target", "final", "code", "qty", "ft", "collision", "duplicate"}.
+    "target" is the planned name (None without a party code), "final" the
+    Done path it would land on; "collision" means the name is taken in Done
+    (or by an earlier file of the folder) and will get a " (n)" suffix.
+    With check_duplicates, a collision with a file of identical content in
+    Done is flagged as "duplicate" (costs a read of both files).
+    plot_sizes (path → inches, read from the plot) fills "ft" for files
+    whose name has no size.
+    """
+    entries = {}
+    if not files:
+        return entries
+    done_folder = files[0].parent / DONE_FOLDER_NAME
+    code = party_map.get(files[0].parent.name)
+    if code and taken is None:
+        taken = folder_names(done_folder)
+    for file_path in files:
+        ft = naming.extract_dimensions(file_path.name)
+        if not ft and plot_sizes and plot_sizes.get(file_path):
+            ft = feet_size(*plot_sizes[file_path])
+        qty = naming.detect_quantity(file_path.stem)
+        entry = {"target": None, "final": None, "code": code, "qty": qty, "ft": ft, "collision": False, "duplicate": False}
+        if code:
+            target = naming.generate_new_filename(file_path.stem, code, file_path.suffix, ft, machine)
+            final = free_name(target, taken)
+            taken.add(os.path.normcase(final))
+            collision = final != target
+            entry.update(target=target, final=done_folder / final, collision=collision)
+            if collision and check_duplicates:
+                entry["duplicate"] = same_content(file_path, done_folder / target)
+        entries[file_path] = entry
+    return entries
+
+
+def group_by_folder(files) -> dict:
+    groups = defaultdict(list)
+    for file_path in files:
+        groups[file_path.parent].append(file_path)
+    return groups
+
+
+class RenamePlan:
+    """
+    Cached plan_folder() entries for every listed file.
+    Plans are computed on one background thread and merged on the Tk
+    thread. Each party folder carries a version that invalidate() bumps,
+    and configure() starts a new epoch when the party map, keywords or
+    machine change; a result computed for an older version is dropped, so
+    a stale plan never overwrites a fresh invalidation.
+    With plot_sizes (a PlotSizes cache), plots without a size in the name
+    are measured on the background thread. get() and tasks() only use
+    sizes that are already cached, so renames go through when_planned()
+    (a batch) or when_measured() (one file) first and never depend on how
+    far the background parse has got.
+    """
+
+    def __init__(self, app, check_duplicates=False, plot_sizes=None):
+        self.app = app
+        self.check_duplicates = check_duplicates
+        self.plot_sizes = plot_sizes
+        self.entries = {}
+        self.epoch = 0
+        self.versions = defaultdict(int)
+        self.config = None
+        self.config_key = None
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rename-plan")
+
+    def configure(self, party_map, naming, machine) -> bool:
+        """Drop every entry if the naming inputs changed; returns True if they did"""
+        key = (id(party_map), naming.keywords, machine)
+        if key == self.config_key:
+            return False
+        self.config_key = key
+        self.config = (party_map, naming, machine)
+        self.entries = {}
+        self.epoch += 1
+        return True
+
+    def swap_party_map(self, party_map, folders, files):
+        """Reloaded party map where only `folders` resolve to a different code: replan just those"""
+        if not self.config:
+            return
+        _, naming, machine = self.config
+        self.config = (party_map, naming, machine)
+        self.config_key = (id(party_map), naming.keywords, machine)
+        self.invalidate(folders, files)
+
+    def rebuild(self, files):
+        """Plan all files from scratch (after a scan or a config change)"""
+        self.entries = {}
+        self.epoch += 1
+        self._submit(files)
+
+    def invalidate(self, folders, files):
+        """Drop the entries of these party folders and replan `files` (their current files)"""
+        folders = set(folders)
+        for folder in folders:
+            self.versions[folder] += 1
+        if self.entries:
+            self.entries = {p: e for p, e in self.entries.items() if p.parent not in folders}
+        self._submit(files)
+
+    def get(self, file_path):
+        """Cached entry, or one computed now (without sibling collisions) if not planned yet"""
+        entry = self.entries.get(file_path)
+        if entry is None and self.config:
+            sizes = self._sizes([file_path], self.config[1], parse=False)
+            entry = plan_folder(
+                [file_path], *self.config, check_duplicates=self.check_duplicates, plot_sizes=sizes
+            )[file_path]
+        return entry
+
+    def tasks(self, files):
+        """(file_path, target) tasks and skipped files, from the plan where it is current"""
+        tasks, skipped = [], []
+        missing = [p for p in files if p not in self.entries]
+        fresh = {}
+        if missing and self.config:
+            sizes = self._sizes(missing, self.config[1], parse=False)
+            for group in group_by_folder(missing).values():
+                fresh.update(plan_folder(
+                    group, *self.config, check_duplicates=self.check_duplicates, plot_sizes=sizes
+                ))
+        for file_path in files:
+            entry = self.entries.get(file_path) or fresh.get(file_path)
+            if entry and entry["target"]:
+                tasks.append((file_path, entry["target"]))
+            else:
+                skipped.append(file_path)
+        return tasks, skipped
+
+    def when_planned(self, files, callback, retries=1):
+        """
+        Call callback() on the Tk thread once every file has a plan entry.
+        Waits behind the builds already queued; files still missing after
+        that are planned again, up to `retries` times (a folder whose plan
+        failed would otherwise never arrive).
+        """
+        if self.config and any(p not in self.entries for p in files):
+            self._after_queued(self._recheck, files, callback, retries)
+        else:
+            callback()
+
+    def when_measured(self, file_path, callback) -> bool:
+        """
+        Call callback() on the Tk thread once get(file_path) can use the
+        file's plot size. A file not planned yet is measured on its own
+        thread instead of waiting behind the queued builds. Returns True
+        if callback() was deferred for a measurement.
+        """
+        naming = self.config[1] if self.config else None
+        if file_path in self.entries or not naming or not self.plot_sizes or not needs_plot_size(file_path, naming):
+            callback()
+            return False
+
+        def measure():
+            self._sizes([file_path], naming)
+            self.app.after(0, callback)
+
+        threading.Thread(target=measure, daemon=True).start()
+        return True
+
+    def _after_queued(self, func, *args):
+        # Results are posted to Tk in order, so func runs after their merges
+        self.pool.submit(self.app.after, 0, func, *args)
+
+    def _recheck(self, files, callback, retries):
+        missing = [p for p in files if p not in self.entries]
+        if not missing or not self.config:
+            callback()
+        elif retries < 1:
+            logging.warning(f"Rename plan incomplete for {len(missing)} files, using cached plot sizes")
+            callback()
+        else:
+            self._submit(missing)
+            self._after_queued(self._recheck, files, callback, retries - 1)
+
+    def duplicates(self, files) -> list:
+        """Files whose planned target already exists in Done with identical content"""
+        return [p for p in files if (self.entries.get(p) or {}).get("duplicate")]
+
+    def _sizes(self, files, naming, parse=True):
+        """Plot sizes of the files that need one; parse=False only reads the cache"""
+        if not self.plot_sizes:
+            return None
+        wanted = [p for p in files if needs_plot_size(p, naming)]
+        if not wanted:
+            return None
+        try:
+            return self.plot_sizes.measure(wanted) if parse else self.plot_sizes.cached(wanted)
+        except Exception as e:
+            logging.warning(f"Plot size measuring failed: {e}")
+            return None
+
+    def _submit(self, files):
+        if not files or not self.config:
+            return
+        groups = group_by_folder(files)
+        versions = {folder: self.versions[folder] for folder in groups}
+        self.pool.submit(self._build, self.epoch, versions, groups, self.config)
+
+    def _build(self, epoch, versions, groups, config):
+        entries = {}
+        sizes = self._sizes([p for files in groups.values() for p in files], config[1])
+        for folder, files in groups.items():
+            if epoch != self.epoch:
+                return
+            try:
+                entries.update(plan_folder(files, *config, check_duplicates=self.check_duplicates, plot_sizes=sizes))
+            except Exception as e:
+                logging.warning(f"Rename plan failed for {folder}: {e}")
+        self.app.after(0, self._merge, epoch, versions, entries)
+
+    def _merge(self, epoch, versions, entries):
+        if epoch != self.epoch:
+            return
+        current = self.versions
+        stale = {folder for folder, version in versions.items() if current[folder] != version}
+        if stale:
+            entries = {p: e for p, e in entries.items() if p.parent not in stale}
+        self.entries.update(entries)
+        self.app.on_plan_updated(len(entries))
+
+    def close(self):
+        self.epoch += 1
+        self.pool.shutdown(wait=False, cancel_futures=True)
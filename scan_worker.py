@@ -0,0 +1,82 @@
+# scan_worker.py - Background folder scans that stream results to the Tk thread
+import time
+import logging
+import threading
+
+from scanner import ScanCancelled
+
+# Results are handed to the UI at most this often, so a big scan costs a
+# few dozen refreshes instead of one per file.
+BATCH_INTERVAL = 0.2
+
+
+class ScanWorker:
+    """
+    Runs one scan at a time on a daemon thread.
+    Every start() bumps the generation and cancels the previous scan; batches
+    from an older generation are dropped on the Tk thread, so results of two
+    scans are never interleaved.
+    """
+
+    def __init__(self, app, on_batch, on_done, on_error):
+        self.app = app
+        self.on_batch = on_batch
+        self.on_done = on_done
+        self.on_error = on_error
+        self.generation = 0
+        self.cancel_event = None
+
+    @property
+    def busy(self):
+        return self.cancel_event is not None
+
+    def start(self, make_iter):
+        """Run make_iter(cancel_event) in the background and stream what it yields"""
+        self.cancel()
+        self.generation += 1
+        self.cancel_event = threading.Event()
+        threading.Thread(
+            target=self._run,
+            args=(self.generation, self.cancel_event, make_iter),
+            daemon=True
+        ).start()
+
+    def cancel(self):
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.cancel_event = None
+
+    def _run(self, generation, cancel_event, make_iter):
+        found = []
+        batch = []
+        last = time.monotonic()
+        try:
+            for path in make_iter(cancel_event):
+                batch.append(path)
+                now = time.monotonic()
+                if now - last >= BATCH_INTERVAL:
+                    found.extend(batch)
+                    self.app.after(0, self._deliver, generation, batch)
+                    batch = []
+                    last = now
+            found.extend(batch)
+            self.app.after(0, self._deliver, generation, batch)
+            self.app.after(0, self._finish, generation, found)
+        except ScanCancelled:
+            logging.info(f"Scan #{generation} cancelled")
+        except Exception as e:
+            self.app.after(0, self._fail, generation, e)
+
+    def _deliver(self, generation, batch):
+        if generation == self.generation and batch:
+            self.on_batch(batch)
+
+    def _finish(self, generation, found):
+        if generation == self.generation:
+            self.cancel_event = None
+            self.on_done(found)
+
+    def _fail(self, generation, error):
+        if generation == self.generation:
+            self.cancel_event = None
+            self.on_error(error)
@@ -0,0 +1,69 @@
+# scanner.py - Single-pass folder scanner for Auto File Renamer
+import os
+import logging
+from pathlib import Path
+
+DONE_FOLDER = "done"
+
+
+class ScanCancelled(Exception):
+    """Raised inside a scan when a newer scan has superseded it"""
+
+
+def is_done_folder(name: str) -> bool:
+    """True if a folder name is a 'Done' folder (any casing)"""
+    return name.lower() == DONE_FOLDER
+
+
+def list_folder(folder):
+    """Return (sub-folder names, file names) of one folder"""
+    dirs, files = [], []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            (dirs if is_dir else files).append(entry.name)
+    return dirs, files
+
+
+def iter_files(root, extensions, finalize=False, lister=list_folder, cancel=None):
+    """
+    Walk root once and yield matching files.
+    New Files mode skips every Done/ subtree; Finalize mode only
+    collects files sitting directly inside a Done/ folder.
+    Setting the optional `cancel` event stops the walk with ScanCancelled.
+    """
+    exts = frozenset(ext.lower() for ext in extensions)
+    stack = [(os.fspath(root), False)]
+    while stack:
+        folder, in_done = stack.pop()
+        if cancel is not None and cancel.is_set():
+            raise ScanCancelled(folder)
+        try:
+            dirs, files = lister(folder)
+        except OSError as e:
+            logging.warning(f"Scan skipped {folder}: {e}")
+            continue
+        if not in_done:
+            for name in dirs:
+                if is_done_folder(name):
+                    if finalize:
+                        stack.append((os.path.join(folder, name), True))
+                else:
+                    stack.append((os.path.join(folder, name), False))
+        if in_done != finalize:
+            continue
+        for name in files:
+            if os.path.splitext(name)[1].lower() not in exts:
+                continue
+            if finalize and "[ok]" in name:
+                continue
+            yield Path(folder, name)
+
+
+def scan_files(root, extensions, finalize=False, lister=list_folder):
+    """Return matching files under root sorted by name (case-insensitive)"""
+    files = iter_files(root, extensions, finalize, lister)
+    return sorted(files, key=lambda p: p.name.lower())
@@ -0,0 +1,73 @@
+# search_index.py - Precomputed search text for the scanned file list
+import bisect
+import itertools
+
+# Keystrokes closer together than this only run one search
+SEARCH_DEBOUNCE_MS = 150
+RECORD_SEP = "\0"
+
+
+class SearchIndex:
+    """
+    Lowercase "name / party / code" text for every listed file, kept up to
+    date per file and joined into one string so a query is a few C-level
+    str.find() calls. A query that extends the previous one only re-checks
+    the previous matches.
+    """
+
+    def __init__(self, text_for):
+        self.text_for = text_for
+        self.texts = {}
+        self.blob = None
+        self.order = []
+        self.starts = []
+        self.last_query = None
+        self.last_result = []
+
+    def _invalidate(self):
+        self.blob = None
+        self.last_query = None
+
+    def rebuild(self, paths):
+        self.texts = {p: self.text_for(p) for p in paths}
+        self._invalidate()
+
+    def add(self, path):
+        self.texts[path] = self.text_for(path)
+        self._invalidate()
+
+    def remove(self, path):
+        if self.texts.pop(path, None) is not None:
+            self._invalidate()
+
+    def _build(self, paths):
+        texts = self.texts
+        parts = [texts.get(p) or texts.setdefault(p, self.text_for(p)) for p in paths]
+        self.order = list(paths)
+        self.starts = list(itertools.accumulate((len(t) + 1 for t in parts[:-1]), initial=0))
+        self.blob = RECORD_SEP.join(parts)
+
+    def search(self, query, paths):
+        """Return the files in `paths` (list order kept) whose text contains query"""
+        query = query.lower()
+        if self.blob is not None and self.last_query is not None and self.last_query in query:
+            result = [p for p in self.last_result if query in self.texts[p]]
+        else:
+            if self.blob is None:
+                self._build(paths)
+            result = self._find_all(query)
+        self.last_query = query
+        self.last_result = result
+        return result
+
+    def _find_all(self, query):
+        blob, starts, order = self.blob, self.starts, self.order
+        result = []
+        i = blob.find(query)
+        while i != -1:
+            k = bisect.bisect_right(starts, i) - 1
+            result.append(order[k])
+            if k + 1 >= len(starts):
+                break
+            i = blob.find(query, starts[k + 1])
+        return result
@@ -0,0 +1,37 @@
+# test_backup.py - Snapshot retention and garbage collection
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backup import BackupStore, file_hash  # noqa: E402
+
+
+def snapshot_versions(store, src, versions, start):
+    for k, text in enumerate(versions):
+        src.write_text(text)
+        store.snapshot([(src, "parties.csv")], now=start + timedelta(minutes=k))
+
+
+def test_retention_deletes_only_dropped_objects(tmp_path):
+    src = tmp_path / "parties.csv"
+    store = BackupStore(tmp_path / "backup", keep=2)
+    snapshot_versions(store, src, ["v1", "v2", "v3"], datetime(2026, 1, 1))
+    objects = {p.name for p in store.objects_dir.iterdir()}
+    assert len(store.snapshots()) == 2
+    assert objects == {s["files"]["parties.csv"] for s in store.snapshots()}
+
+
+def test_corrupt_manifest_keeps_every_object(tmp_path):
+    src = tmp_path / "parties.csv"
+    store = BackupStore(tmp_path / "backup", keep=2)
+    snapshot_versions(store, src, ["v1", "v2"], datetime(2026, 1, 1))
+    old_objects = {p.name for p in store.objects_dir.iterdir()}
+    store.manifest_path.write_text('[{"time": "2026')
+
+    snapshot_versions(store, src, ["v3", "v4", "v5"], datetime(2026, 1, 2))
+    objects = {p.name for p in store.objects_dir.iterdir()}
+    assert old_objects <= objects
+    assert file_hash(src) in objects
+    assert len(list(store.root.glob("snapshots.json.corrupt-*"))) == 1
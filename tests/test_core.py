@@ -0,0 +1,89 @@
+# test_core.py - Collision-safe renames into Done and back
+import errno
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import core  # noqa: E402
+from core import NameSet, folder_names, free_name, move_to_done, rename_no_replace, restore_file  # noqa: E402
+
+
+@pytest.fixture(params=["renameat2", "fallback"])
+def no_replace(request, monkeypatch):
+    """Run a test with the atomic syscall and with the check-then-rename fallback"""
+    if request.param == "fallback":
+        def unavailable(src, dst):
+            raise OSError(errno.ENOSYS, "not available", str(src))
+        monkeypatch.setattr(core, "_renameat2", unavailable)
+    return request.param
+
+
+def test_free_name_skips_taken_names():
+    assert free_name("a.plt", set()) == "a.plt"
+    assert free_name("a.plt", {"a.plt", "a (1).plt"}) == "a (2).plt"
+
+
+def test_free_name_resumes_after_last_suffix():
+    taken = NameSet(["a.plt"])
+    first = free_name("a.plt", taken)
+    taken.add(first)
+    second = free_name("a.plt", taken)
+    assert (first, second) == ("a (1).plt", "a (2).plt")
+    assert taken.counters["a.plt"] == 3
+
+
+def test_rename_no_replace_moves_file(tmp_path, no_replace):
+    src, dst = tmp_path / "src.plt", tmp_path / "dst.plt"
+    src.write_text("src")
+    rename_no_replace(src, dst)
+    assert not src.exists()
+    assert dst.read_text() == "src"
+
+
+def test_rename_no_replace_keeps_existing_target(tmp_path, no_replace):
+    src, dst = tmp_path / "src.plt", tmp_path / "dst.plt"
+    src.write_text("src")
+    dst.write_text("dst")
+    with pytest.raises(FileExistsError):
+        rename_no_replace(src, dst)
+    assert src.read_text() == "src"
+    assert dst.read_text() == "dst"
+
+
+def test_move_to_done_creates_done_and_suffixes_clashes(tmp_path, no_replace):
+    first, second = tmp_path / "one.plt", tmp_path / "two.plt"
+    first.write_text("1")
+    second.write_text("2")
+    taken = folder_names(tmp_path / "Done")
+    assert move_to_done(first, "job.plt", taken) == tmp_path / "Done" / "job.plt"
+    assert move_to_done(second, "job.plt", taken) == tmp_path / "Done" / "job (1).plt"
+    assert (tmp_path / "Done" / "job.plt").read_text() == "1"
+    assert (tmp_path / "Done" / "job (1).plt").read_text() == "2"
+
+
+def test_move_to_done_never_overwrites_a_file_added_after_listing(tmp_path, no_replace):
+    done = tmp_path / "Done"
+    done.mkdir()
+    taken = folder_names(done)
+    (done / "job.plt").write_text("other")
+    src = tmp_path / "new.plt"
+    src.write_text("new")
+    final_path = move_to_done(src, "job.plt", taken)
+    assert final_path.name == "job (1).plt"
+    assert (done / "job.plt").read_text() == "other"
+    assert final_path.read_text() == "new"
+
+
+def test_restore_file_refuses_an_occupied_name(tmp_path, no_replace):
+    old_path = tmp_path / "job.plt"
+    old_path.write_text("someone else")
+    current = tmp_path / "Done" / "renamed.plt"
+    current.parent.mkdir()
+    current.write_text("mine")
+    with pytest.raises(FileExistsError):
+        restore_file(old_path, current)
+    assert current.read_text() == "mine"
+    assert old_path.read_text() == "someone else"
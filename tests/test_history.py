@@ -0,0 +1,93 @@
+# test_history.py - Rename journal replay, compaction and crash tails
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import history  # noqa: E402
+from history import RenameHistory  # noqa: E402
+
+
+def reopen(journal):
+    h = RenameHistory(journal)
+    return h, [(item["old"], item["new"]) for item in h.iter_export()]
+
+
+def test_replay_restores_entries_and_cursor(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    h = RenameHistory(journal)
+    h.add("a", "A")
+    h.add("b", "B", batch="b1")
+    h.add("c", "C", batch="b1")
+    h.undo()
+    h.close()
+
+    h, entries = reopen(journal)
+    assert entries == [("a", "A"), ("b", "B"), ("c", "C")]
+    assert h.index == 1
+    assert h.redo()["new"] == "C"
+    assert h.batches()[0][:2] == ("b1", 2)
+
+
+def test_replay_of_drop_and_clear(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    h = RenameHistory(journal)
+    h.add("a", "A")
+    h.add("b", "B", batch="b1")
+    assert [item["old"] for item in h.take_batch("b1")] == ["b"]
+    h.close()
+    assert reopen(journal)[1] == [("a", "A")]
+
+    h = RenameHistory(journal)
+    assert [item["old"] for item in h.take_all()] == ["a"]
+    h.close()
+    assert reopen(journal)[1] == []
+
+
+def test_compaction_keeps_live_entries_and_cursor(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "COMPACT_SLACK", 2)
+    journal = tmp_path / "journal.jsonl"
+    h = RenameHistory(journal)
+    for i in range(5):
+        h.add(f"old{i}", f"new{i}")
+        h.undo()
+        h.redo()
+    h.undo()
+    h.close()
+    records_before = len(journal.read_text().splitlines())
+
+    h, entries = reopen(journal)
+    h.close()
+    assert len(journal.read_text().splitlines()) < records_before
+    assert entries == [(f"old{i}", f"new{i}") for i in range(5)]
+    assert h.index == 3
+    assert reopen(journal)[0].index == 3
+
+
+def test_torn_last_line_is_cut_before_appending(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    h = RenameHistory(journal)
+    h.add("a", "A")
+    h.close()
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('{"op": "add", "old": "b", "ne')
+
+    h, entries = reopen(journal)
+    assert entries == [("a", "A")]
+    h.add("c", "C")
+    h.close()
+    for line in journal.read_text().splitlines():
+        json.loads(line)
+    assert reopen(journal)[1] == [("a", "A"), ("c", "C")]
+
+
+def test_complete_last_line_without_newline_is_kept(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    journal.write_text(json.dumps({"op": "add", "old": "a", "new": "A", "timestamp": ""}))
+
+    h, entries = reopen(journal)
+    assert entries == [("a", "A")]
+    h.add("b", "B")
+    h.close()
+    assert reopen(journal)[1] == [("a", "A"), ("b", "B")]
@@ -0,0 +1,28 @@
+# test_import_time.py - benchmarks/check_import_time.py as a test, with room for slow CI machines
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from check_import_time import DEFAULT_BUDGETS_MS, TARGETS, measure, snapshot  # noqa: E402
+
+# The script's budgets are for a developer machine; this only catches large regressions
+SLACK = 5
+
+
+@pytest.mark.parametrize("module", list(TARGETS))
+def test_import_budget_and_lazy_modules(module):
+    if module == "app" and importlib.util.find_spec("customtkinter") is None:
+        pytest.skip("customtkinter is not installed")
+    budget = DEFAULT_BUDGETS_MS[module] * SLACK
+    forbidden = TARGETS[module][1]
+    before = snapshot()
+    results = [measure(module) for _ in range(3)]
+    assert snapshot() == before, "import created files"
+    leaked = sorted({m for _, loaded in results for m in loaded if m.split(".")[0] in forbidden})
+    assert not leaked, f"{module} eagerly imports {', '.join(leaked)}"
+    best = min(ms for ms, _ in results)
+    assert best <= budget, f"{module} import took {best:.1f} ms > {budget:.0f} ms"
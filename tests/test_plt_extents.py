@@ -0,0 +1,41 @@
+# test_plt_extents.py - Bounding boxes of HPGL pen commands
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from plt_extents import PLU_PER_INCH, plot_extents, scan_extents  # noqa: E402
+
+
+def test_absolute_rectangle_ignores_pen_up_moves():
+    data = b"IN;SP1;PU1016,1016;PD37592,1016,37592,49784,1016,49784,1016,1016;PU0,0;SP0;"
+    assert scan_extents(data) == (36576.0, 48768.0)
+
+
+def test_relative_draw_after_absolute_stroke_starts_at_its_end():
+    # The absolute stroke ends at 1016,1016; the relative move and draw go on from there
+    data = b"PU0,0;PD1016,1016;PU;PR1016,0;PD1016,0;"
+    assert scan_extents(data) == (3048.0, 1016.0)
+
+
+def test_absolute_after_relative():
+    data = b"IN;PA;PU100,100;PR;PD1016,0,0,2032;PA;PD100,100;"
+    assert scan_extents(data) == (1016.0, 2032.0)
+
+
+def test_runs_of_single_point_commands_and_whitespace_separators():
+    data = b"IN;PU0 0\nPD 1016 0;PD1016,1016;\nPD0,1016;PU;"
+    assert scan_extents(data) == (1016.0, 1016.0)
+
+
+def test_nothing_drawn():
+    assert scan_extents(b"IN;PU0,0;PU500,500;") is None
+
+
+def test_plot_extents_in_inches(tmp_path):
+    path = tmp_path / "job.plt"
+    path.write_bytes(b"IN;PU0,0;PD%d,0,%d,%d;" % (36 * PLU_PER_INCH, 36 * PLU_PER_INCH, 48 * PLU_PER_INCH))
+    assert plot_extents(path) == (36.0, 48.0)
+    empty = tmp_path / "empty.plt"
+    empty.write_bytes(b"")
+    assert plot_extents(empty) is None
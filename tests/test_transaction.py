@@ -0,0 +1,130 @@
+# test_transaction.py - Recovering interrupted batch renames
+import json
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from batch import BatchExecutor  # noqa: E402
+from core import move_to_done  # noqa: E402
+import transaction  # noqa: E402
+from transaction import BatchTransaction  # noqa: E402
+
+
+def make_files(folder, count):
+    folder.mkdir(exist_ok=True)
+    files = []
+    for i in range(count):
+        path = folder / f"job{i}.plt"
+        path.write_text(str(i))
+        files.append(path)
+    return files
+
+
+def crash(txn):
+    """Leave the transaction file as a killed process would"""
+    txn.close()
+
+
+def test_each_batch_gets_its_own_file(tmp_path):
+    files = make_files(tmp_path / "party", 2)
+    first = BatchTransaction.begin(tmp_path, [(files[0], "a.plt")])
+    second = BatchTransaction.begin(tmp_path, [(files[1], "b.plt")])
+    crash(first)
+    crash(second)
+    assert first.path != second.path
+    assert BatchTransaction.unfinished(tmp_path) == sorted([first.path, second.path])
+
+
+def test_recover_reconciles_intents_and_lists_pending(tmp_path):
+    files = make_files(tmp_path / "party", 3)
+    txn = BatchTransaction.begin(tmp_path, [(p, f"new{i}.plt") for i, p in enumerate(files)])
+    # File 0 finished; file 1 moved but its "applied" record was lost; file 2 never ran
+    txn.mark_intent(0, files[0].parent / "Done" / "new0.plt")
+    txn.mark_applied(0, move_to_done(files[0], "new0.plt"))
+    txn.mark_intent(1, files[1].parent / "Done" / "new1.plt")
+    move_to_done(files[1], "new1.plt")
+    crash(txn)
+
+    txn = BatchTransaction.recover(txn.path)
+    assert txn.recovered
+    assert txn.applied == {0: files[0].parent / "Done" / "new0.plt", 1: files[1].parent / "Done" / "new1.plt"}
+    assert txn.pending() == [2]
+    assert [r["error"] for r in txn.results()] == [None, None, "Not processed"]
+    txn.close()
+
+
+def test_recover_ignores_a_torn_last_record(tmp_path):
+    files = make_files(tmp_path / "party", 1)
+    txn = BatchTransaction.begin(tmp_path, [(files[0], "new.plt")])
+    crash(txn)
+    with open(txn.path, "a", encoding="utf-8") as f:
+        f.write('{"op": "applied", "i": 0, "ne')
+    txn = BatchTransaction.recover(txn.path)
+    assert txn.applied == {}
+    assert txn.pending() == [0]
+    txn.close()
+
+
+def test_roll_back_restores_files_and_drops_the_transaction(tmp_path):
+    files = make_files(tmp_path / "party", 3)
+    txn = BatchTransaction.begin(tmp_path, [(p, f"new{i}.plt") for i, p in enumerate(files)])
+    for i in range(2):
+        txn.mark_applied(i, move_to_done(files[i], f"new{i}.plt"))
+    crash(txn)
+
+    txn = BatchTransaction.recover(txn.path)
+    restored, errors = txn.roll_back()
+    assert (restored, errors) == (2, [])
+    assert all(p.exists() for p in files)
+    assert list((tmp_path / "party" / "Done").iterdir()) == []
+    assert BatchTransaction.unfinished(tmp_path) == []
+
+
+def test_roll_back_never_overwrites_a_reused_name(tmp_path):
+    files = make_files(tmp_path / "party", 1)
+    txn = BatchTransaction.begin(tmp_path, [(files[0], "new.plt")])
+    txn.mark_applied(0, move_to_done(files[0], "new.plt"))
+    crash(txn)
+    files[0].write_text("someone else")
+
+    restored, errors = BatchTransaction.recover(txn.path).roll_back()
+    assert restored == 0 and len(errors) == 1
+    assert files[0].read_text() == "someone else"
+    assert (tmp_path / "party" / "Done" / "new.plt").read_text() == "0"
+
+
+def test_executor_records_an_intent_before_every_rename(tmp_path):
+    files = make_files(tmp_path / "a", 3) + make_files(tmp_path / "b", 3)
+    tasks = [(p, f"{p.parent.name}-{p.name}") for p in files]
+    txn = BatchTransaction.begin(tmp_path, tasks)
+    seen = []
+    lock = threading.Lock()
+
+    def on_intent(i, final_path):
+        txn.mark_intent(i, final_path)
+        # The intent is already in the file when the rename is about to run
+        record = json.dumps({"op": "intent", "i": i, "new": str(final_path)})
+        with lock:
+            seen.append((i, record in txn.path.read_text(encoding="utf-8") and tasks[i][0].exists()))
+
+    BatchExecutor(workers=2).run(tasks, on_result=lambda i, r: txn.mark_applied(i, r["new"]), on_intent=on_intent)
+    # Retries (Done created on the first rename) record a fresh intent
+    assert {i for i, _ in seen} == set(range(len(tasks)))
+    assert all(ok for _, ok in seen)
+    txn.finish()
+    assert not txn.path.exists()
+
+
+def test_intents_are_fsynced_other_records_are_grouped(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(transaction.os, "fsync", lambda fd: synced.append(fd))
+    files = make_files(tmp_path / "party", 2)
+    txn = BatchTransaction.begin(tmp_path, [(p, f"new{i}.plt") for i, p in enumerate(files)])
+    synced.clear()
+    txn.mark_intent(0, files[0].parent / "Done" / "new0.plt")
+    assert len(synced) == 1
+    txn.mark_failed(1, "test")
+    assert len(synced) == 1
+    txn.close()
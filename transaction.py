@@ -0,0 +1,194 @@
+# transaction.py - Write-ahead record of a batch rename for crash recovery
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from core import rename_no_replace
+
+FSYNC_EVERY = 64
+# One file per batch, so an interrupted batch the user deferred is never
+# overwritten by the next one; "pending_batch.jsonl" is the older single file
+TXN_PATTERN = "pending_batch*.jsonl"
+
+
+def new_batch_id() -> str:
+    return datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+
+
+class BatchTransaction:
+    """
+    A batch rename written down before it runs.
+    The plan is fsynced first. Before each rename the resolved final path
+    is recorded as an "intent" and fsynced, then the file is marked applied
+    or failed as it finishes. The file is deleted once the batch is recorded
+    in history, so a file left behind means the batch was interrupted and
+    can be rolled forward or back on the next start. An in_place batch
+    (finalize) renames files inside their folder instead of moving them
+    into Done.
+    """
+
+    def __init__(self, path, batch_id, tasks, in_place=False):
+        self.path = Path(path)
+        self.batch_id = batch_id
+        self.tasks = tasks
+        self.in_place = in_place
+        self.applied = {}
+        self.failed = {}
+        self.intents = {}
+        self.recovered = False
+        self.lock = threading.Lock()
+        # Held across an fsync, which runs outside self.lock so writers go on
+        self.sync_lock = threading.Lock()
+        self._file = None
+        self._written = 0
+        self._synced = 0
+
+    @classmethod
+    def begin(cls, folder, tasks, in_place=False):
+        """Write and fsync the plan to a new file in folder; tasks are (file_path, new_name) pairs"""
+        batch_id = new_batch_id()
+        txn = cls(Path(folder) / f"pending_batch-{batch_id}.jsonl", batch_id, tasks, in_place)
+        with open(txn.path, "x", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "op": "plan",
+                "batch": txn.batch_id,
+                "in_place": in_place,
+                "tasks": [[str(old), new_name] for old, new_name in tasks]
+            }) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        txn._file = open(txn.path, "a", encoding="utf-8")
+        return txn
+
+    @staticmethod
+    def unfinished(folder) -> list:
+        """Transaction files of interrupted batches in folder, oldest first"""
+        return sorted(Path(folder).glob(TXN_PATTERN))
+
+    @classmethod
+    def recover(cls, path):
+        """Load an interrupted batch left at path, or return None"""
+        path = Path(path)
+        if not path.exists():
+            return None
+        txn = None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line
+                    op = record.get("op")
+                    if op == "plan":
+                        tasks = [(Path(old), new_name) for old, new_name in record["tasks"]]
+                        txn = cls(path, record["batch"], tasks, record.get("in_place", False))
+                    elif txn and op == "intent":
+                        txn.intents[record["i"]] = Path(record["new"])
+                    elif txn and op == "applied":
+                        txn.applied[record["i"]] = Path(record["new"])
+                    elif txn and op == "failed":
+                        txn.failed[record["i"]] = record["error"]
+        except OSError as e:
+            logging.error(f"Could not read unfinished batch: {e}")
+            return None
+        if txn is None:
+            path.unlink(missing_ok=True)
+            return None
+        txn.recovered = True
+        txn._reconcile()
+        txn._file = open(path, "a", encoding="utf-8")
+        return txn
+
+    def _reconcile(self):
+        """
+        Files that moved but whose "applied" record never hit the disk: the
+        source is gone and its last intent path exists. Without an intent
+        the file's whereabouts are unknown, so it is left alone.
+        """
+        for i, (old, _) in enumerate(self.tasks):
+            if i in self.applied or old.exists():
+                continue
+            landed = self.intents.get(i)
+            if landed and landed.exists():
+                self.applied[i] = landed
+                self.failed.pop(i, None)
+
+    def _write(self, record, sync=False):
+        """Append a record; with sync=True it is on disk when this returns"""
+        with self.lock:
+            if not self._file:
+                return
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+            self._written += 1
+            seq = self._written
+        if sync or seq - self._synced >= FSYNC_EVERY:
+            self._sync_through(seq)
+
+    def _sync_through(self, seq):
+        """fsync until record seq is on disk; one fsync covers every record written before it"""
+        with self.sync_lock:
+            if self._synced >= seq:
+                return
+            with self.lock:
+                if not self._file:
+                    return
+                written = self._written
+                fd = self._file.fileno()
+            os.fsync(fd)
+            self._synced = written
+
+    def mark_intent(self, i, final_path):
+        """Record where file i is about to be renamed to; on disk before the rename runs"""
+        self._write({"op": "intent", "i": i, "new": str(final_path)}, sync=True)
+
+    def mark_applied(self, i, final_path):
+        self.applied[i] = Path(final_path)
+        self._write({"op": "applied", "i": i, "new": str(final_path)})
+
+    def mark_failed(self, i, error):
+        self.failed[i] = error
+        self._write({"op": "failed", "i": i, "error": error})
+
+    def pending(self):
+        """Plan indexes not applied yet whose source file still exists"""
+        return [i for i, (old, _) in enumerate(self.tasks) if i not in self.applied and old.exists()]
+
+    def results(self):
+        """One {"old", "new", "error"} dict per planned file"""
+        results = []
+        for i, (old, _) in enumerate(self.tasks):
+            if i in self.applied:
+                results.append({"old": old, "new": self.applied[i], "error": None})
+            else:
+                results.append({"old": old, "new": None, "error": self.failed.get(i, "Not processed")})
+        return results
+
+    def close(self):
+        """Stop writing but keep the file for recovery"""
+        with self.sync_lock, self.lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def finish(self):
+        """Batch is fully recorded elsewhere; drop the transaction file"""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def roll_back(self):
+        """Move every applied file back to its original name; returns (restored, errors)"""
+        restored, errors = 0, []
+        for i, final_path in sorted(self.applied.items(), reverse=True):
+            old = self.tasks[i][0]
+            try:
+                rename_no_replace(final_path, old)
+                restored += 1
+            except OSError as e:
+                errors.append(f"{final_path.name}: {e}")
+        self.finish()
+        return restored, errors
@@ -0,0 +1,372 @@
+# widgets.py - Custom widgets for Auto File Renamer
+import tkinter as tk
+from tkinter import ttk
+import tkinter.font as tkfont
+import customtkinter as ctk
+
+ROW_PADDING = 4
+WHEEL_ROWS = 3
+
+
+class VirtualFileList(ctk.CTkFrame):
+    """
+    List view that only draws the rows currently visible.
+    Rows come from a backing list and are formatted on demand, so scrolling
+    and refreshing cost the same for 100 files or 100k, and a click maps to
+    its list index with one division.
+    """
+
+    def __init__(self, master, format_row, command=None, font=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.format_row = format_row
+        self.command = command
+        self.items = []
+        self.top = 0
+        self.selected = None
+        self.text_ids = []
+        if font:
+            self.row_font = tkfont.Font(self, family=font[0], size=font[1])
+        else:
+            self.row_font = tkfont.nametofont("TkFixedFont")
+        self.row_height = self.row_font.metrics("linespace") + ROW_PADDING
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        self.header = ctk.CTkLabel(self, text="", font=font, anchor="w", justify="left")
+        self.header.grid(row=0, column=0, columnspan=2, sticky="we", padx=10, pady=(6, 0))
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, borderwidth=0, cursor="hand2")
+        self.canvas.grid(row=1, column=0, sticky="nswe", padx=(10, 0), pady=6)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.yview)
+        self.scrollbar.grid(row=1, column=1, sticky="ns", pady=6)
+
+        self.highlight = self.canvas.create_rectangle(0, 0, 0, 0, width=0, state="hidden")
+        self._apply_colors()
+
+        self.canvas.bind("<Configure>", lambda e: self._build_rows())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.yview("scroll", -WHEEL_ROWS, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.yview("scroll", WHEEL_ROWS, "units"))
+
+    def _apply_colors(self):
+        theme = ctk.ThemeManager.theme
+        self.canvas.configure(bg=self._apply_appearance_mode(theme["CTkTextbox"]["fg_color"]))
+        self.text_color = self._apply_appearance_mode(theme["CTkTextbox"]["text_color"])
+        self.canvas.itemconfigure(self.highlight, fill=self._apply_appearance_mode(theme["CTkButton"]["fg_color"]))
+        for text_id in self.text_ids:
+            self.canvas.itemconfigure(text_id, fill=self.text_color)
+
+    def _set_appearance_mode(self, mode_string):
+        super()._set_appearance_mode(mode_string)
+        self._apply_colors()
+
+    @property
+    def page_size(self):
+        return max(1, self.canvas.winfo_height() // self.row_height)
+
+    def _build_rows(self):
+        """Keep one canvas text item per visible row"""
+        needed = self.page_size + 1
+        while len(self.text_ids) < needed:
+            y = len(self.text_ids) * self.row_height + ROW_PADDING // 2
+            self.text_ids.append(self.canvas.create_text(
+                2, y, anchor="nw", font=self.row_font, fill=self.text_color
+            ))
+        while len(self.text_ids) > needed:
+            self.canvas.delete(self.text_ids.pop())
+        self.yview("scroll", 0, "units")
+
+    def set_items(self, items, header=None, keep_position=False):
+        """Show a new backing list; only the visible rows are formatted"""
+        self.items = items
+        self.selected = None
+        if header is not None:
+            self.header.configure(text=header)
+        if not keep_position:
+            self.top = 0
+        self.refresh()
+
+    def refresh(self):
+        """Redraw after the backing list changed in place"""
+        self.yview("scroll", 0, "units")
+
+    def yview(self, *args):
+        """Scrollbar protocol: ("moveto", fraction) or ("scroll", n, "units"|"pages")"""
+        total = len(self.items)
+        page = self.page_size
+        if args and args[0] == "moveto":
+            self.top = int(float(args[1]) * total)
+        elif args and args[0] == "scroll":
+            step = int(args[1]) * (page if args[2] == "pages" else 1)
+            self.top += step
+        self.top = max(0, min(self.top, total - page))
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + page) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self._draw()
+
+    def _draw(self):
+        items = self.items
+        for offset, text_id in enumerate(self.text_ids):
+            index = self.top + offset
+            text = self.format_row(items[index]) if index < len(items) else ""
+            self.canvas.itemconfigure(text_id, text=text)
+        if self.selected is not None and 0 <= self.selected - self.top < len(self.text_ids):
+            y = (self.selected - self.top) * self.row_height
+            self.canvas.coords(self.highlight, 0, y, self.canvas.winfo_width(), y + self.row_height)
+            self.canvas.itemconfigure(self.highlight, state="normal")
+        else:
+            self.canvas.itemconfigure(self.highlight, state="hidden")
+
+    def _on_wheel(self, event):
+        direction = -1 if event.delta > 0 else 1
+        self.yview("scroll", direction * WHEEL_ROWS, "units")
+
+    def _on_click(self, event):
+        index = self.top + int(event.y // self.row_height)
+        if index >= len(self.items):
+            return
+        self.selected = index
+        self._draw()
+        if self.command:
+            self.command(index)
+
+
+class EditableGrid(ctk.CTkFrame):
+    """
+    Spreadsheet-style table on a ttk.Treeview, so thousands of rows cost
+    no widgets of their own. Double-click (or Enter) opens an entry over a
+    cell of an editable column; Enter commits and moves down, Tab moves to
+    the next editable column, Escape cancels. `on_change(row_id, values)`
+    may return recomputed values (e.g. a preview column); rows for which
+    `validate(values)` returns an error are tinted. `completers` maps a
+    column key to complete(text) → [(value, label)], shown under the cell
+    while typing; Up/Down pick, Enter accepts.
+    """
+
+    def __init__(self, master, columns, validate=None, on_change=None, completers=None, font=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.keys = [key for key, _, _, _ in columns]
+        self.editable = [i for i, (_, _, _, editable) in enumerate(columns) if editable]
+        self.validate = validate
+        self.on_change = on_change
+        self.completers = completers or {}
+        self.errors = {}
+        self.editor = None
+        self.suggestions = None
+        self.suggestion_values = []
+        self.font = tkfont.Font(self, family=font[0], size=font[1]) if font else tkfont.nametofont("TkDefaultFont")
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        self.style_name = f"Grid{id(self)}.Treeview"
+        self.tree = ttk.Treeview(self, columns=self.keys, show="headings", style=self.style_name)
+        for key, heading, width, editable in columns:
+            self.tree.heading(key, text=f"✏️ {heading}" if editable else heading)
+            self.tree.column(key, width=width, stretch=not editable, anchor="center" if editable else "w")
+        self.tree.grid(row=0, column=0, sticky="nswe")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.tree.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self._apply_colors()
+
+        self.tree.bind("<Double-1>", self._on_double_click)
+        self.tree.bind("<Return>", lambda e: self._edit_focused())
+
+    def _apply_colors(self):
+        theme = ctk.ThemeManager.theme
+        bg = self._apply_appearance_mode(theme["CTkTextbox"]["fg_color"])
+        fg = self._apply_appearance_mode(theme["CTkTextbox"]["text_color"])
+        accent = self._apply_appearance_mode(theme["CTkButton"]["fg_color"])
+        style = ttk.Style(self)
+        style.configure(self.style_name, background=bg, fieldbackground=bg, foreground=fg,
+                        font=self.font, rowheight=self.font.metrics("linespace") + 8)
+        style.map(self.style_name, background=[("selected", accent)])
+        self.tree.tag_configure("invalid", background="#7a2a2a")
+
+    def _set_appearance_mode(self, mode_string):
+        super()._set_appearance_mode(mode_string)
+        self._apply_colors()
+
+    # ============ Rows ============
+
+    def set_rows(self, rows):
+        """Replace all rows with [(row_id, values)]"""
+        self.tree.delete(*self.tree.get_children())
+        self.errors = {}
+        for row_id, values in rows:
+            self.tree.insert("", "end", iid=row_id, values=list(values))
+            self._check(row_id, list(values))
+
+    def rows(self):
+        """[(row_id, values)] in display order"""
+        return [(row_id, self.values(row_id)) for row_id in self.tree.get_children()]
+
+    def values(self, row_id):
+        return [str(v) for v in self.tree.item(row_id, "values")]
+
+    def selection(self):
+        return list(self.tree.selection())
+
+    def focus_row(self, row_id):
+        self.tree.selection_set(row_id)
+        self.tree.focus(row_id)
+        self.tree.see(row_id)
+
+    def set_value(self, row_id, key, value):
+        values = self.values(row_id)
+        values[self.keys.index(key)] = value
+        if self.on_change:
+            values = self.on_change(row_id, values) or values
+        self.tree.item(row_id, values=values)
+        self._check(row_id, values)
+
+    def set_column(self, key, value, row_ids):
+        for row_id in row_ids:
+            self.set_value(row_id, key, value)
+
+    def revalidate(self):
+        """Re-run validate on every row (e.g. after the rules were reloaded)"""
+        for row_id in self.tree.get_children():
+            self._check(row_id, self.values(row_id))
+
+    def _check(self, row_id, values):
+        error = self.validate(values) if self.validate else None
+        if error:
+            self.errors[row_id] = error
+            self.tree.item(row_id, tags=("invalid",))
+        elif self.errors.pop(row_id, None) is not None:
+            self.tree.item(row_id, tags=())
+
+    # ============ In-cell editing ============
+
+    def _on_double_click(self, event):
+        row_id = self.tree.identify_row(event.y)
+        column = self.tree.identify_column(event.x)
+        if row_id and column:
+            index = int(column[1:]) - 1
+            if index in self.editable:
+                self.edit(row_id, index)
+
+    def _edit_focused(self):
+        row_id = self.tree.focus()
+        if row_id and self.editable:
+            self.edit(row_id, self.editable[0])
+
+    def edit(self, row_id, index):
+        """Open the cell editor on (row_id, column index)"""
+        self._close_editor(commit=True)
+        self.tree.see(row_id)
+        self.tree.update_idletasks()
+        bbox = self.tree.bbox(row_id, self.keys[index])
+        if not bbox:
+            return
+        x, y, width, height = bbox
+        editor = tk.Entry(self.tree, font=self.font, justify="center")
+        editor.insert(0, self.values(row_id)[index])
+        editor.select_range(0, "end")
+        editor.place(x=x, y=y, width=width, height=height)
+        editor.focus_set()
+        self.editor = (editor, row_id, index)
+        editor.bind("<Return>", lambda e: self._accept_suggestion() or self._move(1, 0))
+        editor.bind("<Down>", lambda e: self._step_suggestion(1) or self._move(1, 0))
+        editor.bind("<Up>", lambda e: self._step_suggestion(-1) or self._move(-1, 0))
+        if self.keys[index] in self.completers:
+            editor.bind("<KeyRelease>", self._on_key_release)
+        editor.bind("<Tab>", lambda e: self._move(0, 1) or "break")
+        editor.bind("<Escape>", lambda e: self._close_editor(commit=False) or "break")
+        editor.bind("<FocusOut>", lambda e: self._on_focus_out(e.widget))
+
+    def _on_focus_out(self, widget):
+        # Late FocusOut of an editor that was already replaced must not close the new one
+        if self.editor and self.editor[0] is widget:
+            self._close_editor(commit=True)
+
+    def _close_editor(self, commit):
+        if not self.editor:
+            return
+        editor, row_id, index = self.editor
+        self.editor = None
+        self._hide_suggestions()
+        if commit:
+            self.set_value(row_id, self.keys[index], editor.get().strip())
+        editor.destroy()
+        self.tree.focus_set()
+
+    def _move(self, rows, columns):
+        """Commit the cell and edit the next (rows=1) / previous (rows=-1) row or next column"""
+        _, row_id, index = self.editor
+        self._close_editor(commit=True)
+        if rows > 0:
+            row_id = self.tree.next(row_id)
+        elif rows < 0:
+            row_id = self.tree.prev(row_id)
+        if columns:
+            k = (self.editable.index(index) + columns) % len(self.editable)
+            index = self.editable[k]
+        if row_id:
+            self.focus_row(row_id)
+            self.edit(row_id, index)
+
+    # ============ Completion ============
+
+    def _on_key_release(self, event):
+        if event.keysym in ("Return", "Up", "Down", "Tab", "Escape") or not self.editor:
+            return
+        editor, _, index = self.editor
+        matches = self.completers[self.keys[index]](editor.get())
+        if matches:
+            self._show_suggestions(editor, matches)
+        else:
+            self._hide_suggestions()
+
+    def _show_suggestions(self, editor, matches):
+        if self.suggestions is None:
+            self.suggestions = tk.Listbox(self.tree, font=self.font, activestyle="none", exportselection=False)
+            self.suggestions.bind("<Button-1>", self._on_suggestion_click)
+        self.suggestion_values = [value for value, _ in matches]
+        self.suggestions.delete(0, "end")
+        for _, label in matches:
+            self.suggestions.insert("end", label)
+        self.suggestions.selection_set(0)
+        self.suggestions.configure(height=len(matches))
+        width = max(editor.winfo_width(), max(self.font.measure(label) for _, label in matches) + 16)
+        self.suggestions.place(x=editor.winfo_x(), y=editor.winfo_y() + editor.winfo_height(), width=width)
+        self.suggestions.lift()
+
+    def _hide_suggestions(self):
+        if self.suggestions is not None:
+            self.suggestions.destroy()
+            self.suggestions = None
+            self.suggestion_values = []
+
+    def _step_suggestion(self, step):
+        """Move the highlighted suggestion; False when no list is shown"""
+        if self.suggestions is None:
+            return False
+        current = self.suggestions.curselection()
+        k = max(0, min((current[0] if current else -1) + step, len(self.suggestion_values) - 1))
+        self.suggestions.selection_clear(0, "end")
+        self.suggestions.selection_set(k)
+        return True
+
+    def _accept_suggestion(self):
+        """Put the highlighted suggestion into the editor (the caller commits)"""
+        if self.suggestions is None or not self.editor:
+            return None
+        current = self.suggestions.curselection()
+        if current:
+            editor = self.editor[0]
+            editor.delete(0, "end")
+            editor.insert(0, self.suggestion_values[current[0]])
+        return None
+
+    def _on_suggestion_click(self, event):
+        self.suggestions.selection_clear(0, "end")
+        self.suggestions.selection_set(self.suggestions.nearest(event.y))
+        self._accept_suggestion()
+        self._close_editor(commit=True)
+        return "break"